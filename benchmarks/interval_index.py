@@ -0,0 +1,78 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+# crossover benchmark of 'interval' against 'linear' matching. builds populations of N covering-like
+# hyper-rectangles in d dimensions and times match set queries for random states with both strategies.
+#
+#   python benchmarks/interval_index.py --sizes 1000 10000 100000 --dims 6 11 20
+
+import argparse
+import time
+import numpy as np
+import xcsr
+
+
+class _Classifier:
+    # the minimal classifier interface read by Population.add
+    def __init__(self, cid, bounds, action):
+        self._id = cid
+        self.bounds = bounds
+        self.action = action
+        self.predicted_payoff, self.epsilon, self.fitness = 0.0, 0.0, 0.01
+        self.experience, self.last_time_step, self.action_set_size, self.numerosity = 0, 0, 1, 1
+
+
+def build_population(config, size, dims, p_sharp, width):
+    population = xcsr.Population(config, (dims,), [(0,), (1,)], capacity=size)
+    centers = np.random.uniform(size=(size, dims))
+    lower = centers - np.random.uniform(high=width, size=(size, dims))
+    upper = centers + np.random.uniform(high=width, size=(size, dims))
+
+    # wildcard attributes, as produced by covering
+    wildcards = np.random.uniform(size=(size, dims)) < p_sharp
+    lower[wildcards], upper[wildcards] = 0.0, 1.0
+
+    for i in range(size):
+        population.add(_Classifier(i, np.stack((lower[i], upper[i]), axis=1), (i % 2,)))
+
+    return population
+
+
+def time_queries(population, states):
+    start = time.perf_counter()
+    matched = sum(len(population.match(sigma)) for sigma in states)
+    return (time.perf_counter() - start) / len(states), matched / len(states)
+
+
+def run(sizes, dims, p_sharp, width, queries):
+    print('{:>8} {:>4} {:>12} {:>12} {:>8} {:>10}'.format('N', 'd', 'linear (us)', 'interval (us)', 'speedup',
+                                                        'mean |M|'))
+
+    for d in dims:
+        for size in sizes:
+            np.random.seed(size + d)
+            states = np.random.uniform(size=(queries, d))
+            times = {}
+
+            for matching in ('linear', 'interval'):
+                config = xcsr.Configuration()
+                config.matching = matching
+                population = build_population(config, size, d, p_sharp, width)
+                times[matching], matched = time_queries(population, states)
+
+            print('{:>8} {:>4} {:>12.1f} {:>12.1f} {:>8.2f} {:>10.1f}'.format(
+                size, d, times['linear'] * 1e6, times['interval'] * 1e6, times['linear'] / times['interval'],
+                matched))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--dims', type=int, nargs='+', default=[6, 11, 20])
+    parser.add_argument('--p-sharp', type=float, default=0.33)
+    parser.add_argument('--width', type=float, default=0.29, help='maximum half-width of an interval')
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.sizes, args.dims, args.p_sharp, args.width, args.queries)
@@ -0,0 +1,73 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+# load generator for xcsr.server. opens a number of connections, each keeping a fixed number of requests
+# with random states in flight, and reports throughput, client side latency and the server's latency and
+# batch size histograms as JSON.
+#
+#   python -m xcsr.server classifiers/replication0.xpop --unix /tmp/xcsr.sock &
+#   python benchmarks/server_load.py --unix /tmp/xcsr.sock --connections 16 --in-flight 8 --requests 20000
+
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+from xcsr.server import Client
+
+
+async def _connect(args):
+    if args.unix is not None:
+        return await Client.connect_unix(args.unix)
+
+    return await Client.connect_tcp(args.host, args.port)
+
+
+async def _send(client, states, latencies):
+    for state in states:
+        start = time.perf_counter()
+        await client.predict(state)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    clients = [await _connect(args) for _ in range(args.connections)]
+    dimensions = (await clients[0].stats())['state_shape'][0]
+
+    # every (connection, in-flight slot) sends its own share of the requests one after another
+    senders = args.connections * args.in_flight
+    states = np.random.uniform(size=(args.requests, dimensions))
+    latencies = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[_send(clients[i % args.connections], states[i::senders], latencies)
+                           for i in range(senders)])
+    elapsed = time.perf_counter() - start
+
+    stats = await clients[0].stats()
+
+    for client in clients:
+        await client.close()
+
+    latencies = np.array(latencies)
+    return {'requests': args.requests, 'connections': args.connections, 'in_flight': args.in_flight,
+            'seconds': elapsed, 'requests_per_second': args.requests / elapsed,
+            'client_latency': {'mean': latencies.mean(), 'p50': np.percentile(latencies, 50),
+                               'p99': np.percentile(latencies, 99), 'max': latencies.max()},
+            'server': stats}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='load generator for xcsr.server')
+    parser.add_argument('--unix', help='path of the server\'s Unix domain socket, instead of TCP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--in-flight', type=int, default=8, help='requests in flight on each connection')
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    np.random.seed(args.seed)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
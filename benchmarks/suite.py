@@ -0,0 +1,261 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+# benchmark suite over the mux, rmux and woods2 example scenarios. every case trains one XCSR from a fixed
+# seed for a fixed number of steps (mux, rmux) or episodes (woods2) and reports its throughput, peak memory
+# and per-phase cost (see PhaseProfiler) as JSON. the suite sweeps the population size N and, for the
+# multiplexers, the number of address bits, which sets the input dimensionality to a + 2 ** a.
+#
+# each case runs in a fresh process, one at a time, so that peak memory is the case's own and cases do not
+# compete for the cores. the results of a previous run can be passed as a baseline, every case whose
+# throughput dropped, or whose peak memory grew, by more than the tolerance is flagged and the suite
+# exits with status 1. the phases whose cost grew are listed with every throughput regression. a comparison
+# needs the median of at least MIN_REPEATS runs on both sides, the suite refuses to compare (and exits with
+# status 2) otherwise. benchmarks/baseline.json holds the results of the default suite, with the machine
+# it was run on, and is refreshed with
+#
+#   python benchmarks/suite.py --output benchmarks/baseline.json
+#   python benchmarks/suite.py --baseline benchmarks/baseline.json --output results.json
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import numpy as np
+
+EXAMPLE_SCENARIOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'example_scenarios')
+
+WORKLOADS = ('mux', 'rmux', 'woods2')
+
+# share of a case's run time below which a phase is not compared against the baseline
+MIN_PHASE_SHARE = 0.02
+
+# runs of every case needed to compare against a baseline, fewer are too noisy to flag regressions on
+MIN_REPEATS = 3
+
+
+def _scenario(workload):
+    # the configuration and environment classes of a workload
+    sys.path.insert(0, EXAMPLE_SCENARIOS)
+    import mux
+    import rmux
+    import woods2
+
+    return {'mux': (mux.MUXConfiguration, mux.MUXEnvironment),
+            'rmux': (rmux.RMUXConfiguration, rmux.RMUXEnvironment),
+            'woods2': (woods2.Woods2Configuration, woods2.Woods2Environment)}[workload]
+
+
+def _peak_rss_mb():
+    # peak resident set size of this process, ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def run_case(case):
+    # train one XCSR as described by case and measure it. runs in its own process
+    from xcsr.xcsr import XCSR
+
+    config_class, env_class = _scenario(case['workload'])
+    config = config_class()
+    config.N = case['N']
+    config.profile_phases = True
+
+    if case['address_bits'] is not None:
+        config.address_bits = case['address_bits']
+
+    if config.is_multi_step:
+        config.episodes_per_replication = case['episodes']
+    else:
+        config.steps_per_episode = case['steps']
+
+    # environments draw their first state from the global RNG, before XCSR seeds it
+    np.random.seed(case['seed'])
+    env = env_class(config)
+    xcs_object = XCSR(env=env, config=config, seed=case['seed'])
+    rss_before = _peak_rss_mb()
+
+    start = time.perf_counter()
+
+    if config.is_multi_step:
+        # alternate exploration and exploitation episodes as XCSRDriver does
+        steps = 0
+
+        for _ in range(config.episodes_per_replication):
+            env.reset()
+            xcs_object.reset_metrics()
+            config.p_explr = 0 if np.random.uniform() < 0.5 else 1
+            xcs_object.run_experiment()
+            steps += env.time_step
+    else:
+        xcs_object.run_experiment()
+        steps = config.steps_per_episode
+
+    seconds = time.perf_counter() - start
+    population = xcs_object.get_population()
+
+    return dict(case, dimensions=env.state_shape[0], seconds=seconds, steps_per_second=steps / seconds,
+                total_steps=steps, classifiers=len(population), peak_memory_mb=_peak_rss_mb(),
+                memory_before_mb=rss_before, phases=xcs_object.get_profile())
+
+
+def cases(args):
+    for workload in args.workloads:
+        # woods2 has a fixed input size
+        address_bits = [None] if workload == 'woods2' else args.address_bits
+
+        for bits in address_bits:
+            for size in args.sizes:
+                yield {'workload': workload, 'N': size, 'address_bits': bits, 'seed': args.seed,
+                       'steps': args.steps, 'episodes': args.episodes}
+
+
+def run(args):
+    results = []
+
+    for case in cases(args):
+        repeats = []
+
+        for _ in range(args.repeats):
+            # a fresh process for every run, spawned so that it does not inherit this process's memory
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                repeats.append(executor.submit(run_case, case).result())
+
+        # the run with the median throughput stands for the case
+        result = sorted(repeats, key=lambda r: r['steps_per_second'])[len(repeats) // 2]
+        result['steps_per_second_runs'] = [r['steps_per_second'] for r in repeats]
+        results.append(result)
+
+        print('{:>7} N={:<6} d={:<4} {:>10.1f} steps/s {:>8.1f} MB'.format(
+            result['workload'], result['N'], result['dimensions'], result['steps_per_second'],
+            result['peak_memory_mb']), file=sys.stderr)
+
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'processor': platform.processor(), 'cpus': os.cpu_count(), 'created': int(time.time()),
+            'repeats': args.repeats, 'cases': results}
+
+
+def repeat_count(results):
+    # runs of every case behind results. results written before the count was stored have it per case
+    if 'repeats' in results:
+        return results['repeats']
+
+    return min((len(result['steps_per_second_runs']) for result in results['cases']), default=0)
+
+
+def _case_key(result):
+    return result['workload'], result['N'], result['address_bits'], result['seed'], result['steps'], \
+           result['episodes']
+
+
+def compare(results, baseline, tolerance, memory_tolerance):
+    # regressions of results against baseline. only cases found in both are compared. a case regressed if
+    # its throughput dropped or its peak memory grew by more than the tolerance. the phases whose cost per
+    # step grew by more than the tolerance are listed with a throughput regression, to pin it on a phase
+    baseline_cases = {_case_key(result): result for result in baseline['cases']}
+    regressions = []
+
+    for result in results['cases']:
+        base = baseline_cases.get(_case_key(result))
+
+        if base is None:
+            continue
+
+        found = {}
+        throughput = result['steps_per_second'] / base['steps_per_second']
+        memory = result['peak_memory_mb'] / base['peak_memory_mb']
+
+        if throughput < 1.0 - tolerance:
+            found['steps_per_second'] = {'baseline': base['steps_per_second'], 'current': result['steps_per_second'],
+                                         'ratio': throughput, 'phases': _phase_regressions(result, base, tolerance)}
+
+        if memory > 1.0 + memory_tolerance:
+            found['peak_memory_mb'] = {'baseline': base['peak_memory_mb'], 'current': result['peak_memory_mb'],
+                                       'ratio': memory}
+
+        if found:
+            regressions.append(dict({key: result[key] for key in ('workload', 'N', 'address_bits', 'dimensions')},
+                                    **found))
+
+    return regressions
+
+
+def _phase_regressions(result, base, tolerance):
+    # the phases whose seconds per step grew by more than tolerance. phases which took less than
+    # MIN_PHASE_SHARE of the baseline run are too short to time reliably and are skipped
+    regressions = {}
+
+    for name, phase in result['phases'].items():
+        base_phase = base['phases'].get(name)
+
+        if base_phase is None or base_phase['total_seconds'] < MIN_PHASE_SHARE * base['seconds']:
+            continue
+
+        current = phase['total_seconds'] / result['total_steps']
+        baseline = base_phase['total_seconds'] / base['total_steps']
+
+        if current > (1.0 + tolerance) * baseline:
+            regressions[name] = {'baseline_seconds_per_step': baseline, 'current_seconds_per_step': current,
+                                 'ratio': current / baseline}
+
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark suite over the example scenarios')
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[400, 2000], help='population sizes N')
+    parser.add_argument('--address-bits', type=int, nargs='+', default=[2, 3],
+                        help='address bits of mux and rmux, a gives a + 2 ** a inputs')
+    parser.add_argument('--steps', type=int, default=5000, help='steps of a mux or rmux case')
+    parser.add_argument('--episodes', type=int, default=200, help='episodes of a woods2 case')
+    parser.add_argument('--repeats', type=int, default=MIN_REPEATS,
+                        help='runs of every case, the median is reported. comparing needs at least MIN_REPEATS')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write the results to, instead of standard output')
+    parser.add_argument('--baseline', help='results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='relative drop in throughput flagged as a regression, and growth in phase cost '
+                             'reported with it')
+    parser.add_argument('--memory-tolerance', type=float, default=0.1,
+                        help='relative growth in peak memory flagged as a regression')
+    args = parser.parse_args()
+    baseline_results = None
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline_results = json.load(f)
+
+        # checked before running, so that a comparison which would be refused does not run the suite first
+        for name, count in (('--repeats', args.repeats), (args.baseline, repeat_count(baseline_results))):
+            if count < MIN_REPEATS:
+                print('error: {} has {} runs per case, comparing needs at least {}'.format(name, count, MIN_REPEATS),
+                      file=sys.stderr)
+                sys.exit(2)
+
+    suite_results = run(args)
+    regressed = False
+
+    if baseline_results is not None:
+        suite_results['regressions'] = compare(suite_results, baseline_results, args.tolerance,
+                                               args.memory_tolerance)
+
+        regressed = len(suite_results['regressions']) > 0
+
+        for regression in suite_results['regressions']:
+            print('regression: {}'.format(json.dumps(regression)), file=sys.stderr)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(suite_results, f, indent=2)
+    else:
+        print(json.dumps(suite_results, indent=2))
+
+    sys.exit(1 if regressed else 0)
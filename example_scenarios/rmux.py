@@ -5,6 +5,7 @@
 import numpy as np
 import logging
 import shutil
+import tempfile
 import xcsr
 
 
@@ -19,6 +20,9 @@ class RMUXConfiguration(xcsr.Configuration):
 
         self.is_multi_step = False
 
+        # number of address bits, each state holds address_bits + 2 ** address_bits attributes
+        self.address_bits = 2
+
         self.predicate_1 = 0.29
 
         self.predicate_delta = 0.1
@@ -78,16 +82,18 @@ class RMUXEnvironment(xcsr.Environment):
         xcsr.Environment.__init__(self, config, args)
         logging.info('RMUX environment initialized')
 
-        self.state_shape = (6,)
+        self._address_bits = config.address_bits
+        self.state_shape = (self._address_bits + 2 ** self._address_bits,)
         self.action_shape = (1,)
         self.possible_actions = [(0,), (1,)]
+        self._states = None
         self._set_state()
 
     def get_state(self):
         return self._state
 
     def _set_state(self):
-        self._state = [np.random.uniform() for _ in range(self.state_shape[0])]
+        self._state = np.random.uniform(size=self.state_shape[0])
 
     def step(self, action):
         self.time_step += 1
@@ -97,14 +103,32 @@ class RMUXEnvironment(xcsr.Environment):
 
     def _determine_rho(self, action):
         self.end_of_program = True
+        return int(self._determine_rhos(self._state[None, :], [action])[0])
 
-        address_bits = ''.join(str(round(x)) for x in self._state[:2])
-        index_bit = int(address_bits, 2)
-        data_bit_index = index_bit + len(address_bits)
-        data_bit = round(self._state[data_bit_index])
+    def get_states(self, k):
+        # draw a whole block of k states at once
+        if self._states is None or len(self._states) != k:
+            self._set_states(k)
 
-        rho = int(data_bit == action[0])
-        return rho
+        return self._states
+
+    def _set_states(self, k):
+        self._states = np.random.uniform(size=(k, self.state_shape[0]))
+
+    def step_batch(self, actions):
+        self.time_step += 1
+        self.end_of_program = True
+        rhos = self._determine_rhos(self._states, actions)
+        self._set_states(len(self._states))
+        return rhos
+
+    def _determine_rhos(self, states, actions):
+        # the address bits select one of the data bits, the payoff is 1 for actions equal to that data bit
+        address_bits = np.round(states[:, :self._address_bits]).astype(int)
+        index_bits = address_bits @ (2 ** np.arange(self._address_bits - 1, -1, -1))
+        data_bits = np.round(states[np.arange(len(states)), index_bits + self._address_bits])
+
+        return (data_bits == np.asarray(actions)[:, 0]).astype(float)
 
     def termination_criteria_met(self):
         return self.time_step >= self._max_steps
@@ -122,7 +146,7 @@ def run_xcsr(ENV, CONFIG):
     driver.config_class = CONFIG
     driver.env_class = ENV
     driver.replications = 5
-    driver.save_location = '/Users/bcr/Desktop/'
+    driver.save_location = tempfile.gettempdir()
     driver.experiment_name = 'TMP'
     driver.run()
 
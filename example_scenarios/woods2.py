@@ -5,6 +5,7 @@
 import numpy as np
 import logging
 import shutil
+import tempfile
 import xcsr
 
 
@@ -168,7 +169,7 @@ def run_xcsr(ENV, CONFIG):
     driver.config_class = CONFIG
     driver.env_class = ENV
     driver.replications = 5
-    driver.save_location = '/Users/bcr/Desktop/'
+    driver.save_location = tempfile.gettempdir()
     driver.experiment_name = 'TMP'
     driver.run()
 
@@ -0,0 +1,9 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+import os
+import sys
+
+# the example scenarios are not a package, tests import them as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'example_scenarios'))
@@ -0,0 +1,42 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.checkpoint import Checkpointer, load_checkpoint
+from xcsr.xcsr import XCSR
+
+import numpy as np
+import pytest
+import mux
+import rmux
+
+
+@pytest.mark.parametrize('scenario', [(mux.MUXConfiguration, mux.MUXEnvironment),
+                                      (rmux.RMUXConfiguration, rmux.RMUXEnvironment)])
+@pytest.mark.parametrize('deletion_strategy', ['beta', 'vote'])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, scenario, deletion_strategy):
+    config_class, env_class = scenario
+    config = config_class()
+    config.steps_per_episode = 600
+    config.N = 200
+    config.deletion_strategy = deletion_strategy
+    filename = str(tmp_path / 'replication.ckpt')
+
+    # the only checkpoint is taken after the 400th problem
+    np.random.seed(0)
+    checkpointer = Checkpointer(filename, 400)
+    uninterrupted = XCSR(env_class(config), config, checkpointer=checkpointer, seed=0)
+    uninterrupted.run_experiment()
+    checkpointer.close()
+
+    resumed = XCSR.from_snapshot(load_checkpoint(filename))
+    assert resumed.environment.time_step == 400
+    resumed.run_experiment()
+
+    expected, found = uninterrupted._population.arrays(), resumed._population.arrays()
+    assert expected.keys() == found.keys()
+
+    for name in expected:
+        np.testing.assert_array_equal(found[name], expected[name], err_msg=name)
+
+    assert resumed.metrics_history == uninterrupted.metrics_history
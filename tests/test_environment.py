@@ -0,0 +1,52 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.configuration import Configuration
+from xcsr.environment import Environment
+
+import numpy as np
+
+
+class _CountingEnvironment(Environment):
+    # an environment relying on the default batched interface. reset draws a new state, every step
+    # counts towards its own time_step
+    def __init__(self, config, *args):
+        Environment.__init__(self, config)
+        self.state_shape = (3,)
+        self.possible_actions = [(0,), (1,)]
+        self.reset()
+
+    def get_state(self):
+        return self._state
+
+    def step(self, action):
+        self.time_step += 1
+        return float(action[0])
+
+    def reset(self):
+        Environment.reset(self)
+        self._state = np.random.uniform(size=self.state_shape[0])
+
+    def termination_criteria_met(self):
+        return self.time_step >= self._max_steps
+
+
+def test_default_batch_instances_start_from_their_own_state():
+    np.random.seed(0)
+    env = _CountingEnvironment(Configuration())
+    states = env.get_states(4)
+
+    assert states.shape == (4, 3)
+    assert len(np.unique(states, axis=0)) == 4
+    np.testing.assert_array_equal(states[0], env.get_state())
+
+
+def test_default_batch_instances_count_their_own_time_steps():
+    np.random.seed(0)
+    env = _CountingEnvironment(Configuration())
+    env.step((0,))
+    env.get_states(3)
+
+    np.testing.assert_array_equal(env.step_batch([(0,), (1,), (1,)]), [0.0, 1.0, 1.0])
+    assert [instance.time_step for instance in [env] + env._batch_instances] == [2, 1, 1]
@@ -0,0 +1,63 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.xcsr import XCSR
+
+import numpy as np
+import pytest
+import mux
+import rmux
+
+
+class _RecordingXCSR(XCSR):
+    # records, for every match set, whether it holds exactly the classifiers matching sigma and how many
+    # actions they advocate
+    def __init__(self, *args, **kwargs):
+        XCSR.__init__(self, *args, **kwargs)
+        self.match_sets = []
+
+    def _generate_match_set(self, sigma, _match_set=None):
+        rows = XCSR._generate_match_set(self, sigma, _match_set)
+        exact = np.array_equal(np.sort(rows), self._population.match(sigma))
+        self.match_sets.append((exact, len(np.unique(self._population.action_id[rows]))))
+        return rows
+
+
+def _train(scenario, k):
+    config_class, env_class = scenario
+    config = config_class()
+    config.steps_per_episode = 300
+    np.random.seed(0)
+    xcs_object = _RecordingXCSR(env_class(config), config, seed=0)
+
+    if k > 1:
+        xcs_object.run_lockstep(k)
+    else:
+        xcs_object.run_experiment()
+
+    return config, xcs_object.match_sets
+
+
+@pytest.mark.parametrize('scenario', [(mux.MUXConfiguration, mux.MUXEnvironment),
+                                      (rmux.RMUXConfiguration, rmux.RMUXEnvironment)])
+def test_lockstep_match_sets_satisfy_covering_like_run_experiment(scenario):
+    # every match set, whether formed from a batch match or in run_experiment, holds exactly the classifiers
+    # matching its state and advocates at least theta_mna actions
+    for k in (1, 8):
+        config, match_sets = _train(scenario, k)
+
+        assert len(match_sets) > 0
+        assert all(exact for exact, _ in match_sets)
+        assert min(num_actions for _, num_actions in match_sets) >= config.theta_mna
+
+
+@pytest.mark.parametrize('k', [1, 4, 7])
+def test_lockstep_trains_on_steps_per_episode_problems(k):
+    config = mux.MUXConfiguration()
+    config.steps_per_episode = 500
+    xcs_object = XCSR(mux.MUXEnvironment(config), config, seed=0)
+    xcs_object.run_lockstep(k)
+
+    assert xcs_object.metrics_history['steps'] == config.steps_per_episode
+    assert len(xcs_object.metrics_history['rhos']) == config.steps_per_episode
@@ -0,0 +1,33 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.metrics import METRICS, MetricsHistory, MetricsWriter
+from xcsr.xcsr import XCSR
+
+import numpy as np
+import rmux
+
+
+def _train(metrics):
+    config = rmux.RMUXConfiguration()
+    config.steps_per_episode = 300
+    np.random.seed(0)
+    xcs_object = XCSR(rmux.RMUXEnvironment(config), config, metrics=metrics, seed=0)
+    xcs_object.run_experiment()
+    return xcs_object
+
+
+def test_metrics_history_reads_back_a_metrics_writer(tmp_path):
+    # the chunk size does not divide the step count, part of the metrics are still buffered
+    writer = MetricsWriter({key: str(tmp_path / '{}.npy'.format(key)) for key in METRICS + ('steps',)},
+                           chunk_size=128)
+    on_disk = _train(writer).metrics_history
+    in_memory = _train(MetricsHistory()).metrics_history
+
+    assert on_disk['steps'] == in_memory['steps'] == 300
+
+    for key in METRICS:
+        np.testing.assert_array_equal(on_disk[key], in_memory[key])
+
+    writer.close()
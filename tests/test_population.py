@@ -0,0 +1,105 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.classifier import Classifier
+from xcsr.population import Population
+from xcsr.xcsr import XCSR
+
+import numpy as np
+import pytest
+import rmux
+
+
+def _train(config, k=1):
+    config.steps_per_episode = 400
+    config.N = 200
+    np.random.seed(0)
+
+    # classifier ids come from a global counter, restart it so that runs can be compared id for id
+    Classifier.CLASSIFIER_ID = 0
+    xcs_object = XCSR(rmux.RMUXEnvironment(config), config, seed=0)
+
+    if k > 1:
+        xcs_object.run_lockstep(k)
+    else:
+        xcs_object.run_experiment()
+
+    return xcs_object
+
+
+@pytest.mark.parametrize('mmap_mode', [None, 'r', 'c'])
+def test_save_load_round_trip(tmp_path, mmap_mode):
+    config = rmux.RMUXConfiguration()
+    population = _train(config)._population
+    filename = str(tmp_path / 'population.xpop')
+    population.save(filename)
+
+    loaded = Population.load(filename, config, mmap_mode=mmap_mode)
+    assert loaded.state_shape == population.state_shape
+    assert loaded.possible_actions == population.possible_actions
+    assert loaded.total_numerosity == population.total_numerosity
+    np.testing.assert_array_equal(loaded.action_numerosity, population.action_numerosity)
+    np.testing.assert_allclose(loaded.action_fitness, population.action_fitness)
+
+    expected, found = population.arrays(), loaded.arrays()
+    assert expected.keys() == found.keys()
+
+    for name in expected:
+        assert found[name].dtype == expected[name].dtype
+        np.testing.assert_array_equal(found[name], expected[name], err_msg=name)
+
+    # the row map and the duplicate index are rebuilt from the file
+    row = len(loaded) // 2
+    assert loaded.row_of(int(loaded.ids[row])) == row
+    assert loaded.find_duplicate(loaded.action_id[row], loaded.lower[row], loaded.upper[row]) == row
+
+
+def test_loaded_population_can_be_changed(tmp_path):
+    config = rmux.RMUXConfiguration()
+    config.debug_population_accounting = True
+    population = _train(config)._population
+    filename = str(tmp_path / 'population.xpop')
+    population.save(filename)
+
+    loaded = Population.load(filename, config)
+    removed_id = int(loaded.ids[0])
+    loaded.remove(0)
+
+    cl = Classifier(config, loaded.state_shape)
+    cl.action = loaded.possible_actions[0]
+    loaded.add(cl)
+
+    assert len(loaded) == len(population)
+    assert cl in loaded and removed_id not in set(loaded.ids)
+    loaded.check_aggregates()
+
+
+def test_empty_population_round_trip(tmp_path):
+    config = rmux.RMUXConfiguration()
+    filename = str(tmp_path / 'population.xpop')
+    Population(config, (3,), [(0,), (1,)]).save(filename)
+
+    loaded = Population.load(filename, config, mmap_mode='r')
+    assert len(loaded) == 0 and loaded.total_numerosity == 0
+    assert loaded.lower.shape == (0, 3)
+
+
+@pytest.mark.parametrize('deletion_strategy', ['beta', 'vote'])
+@pytest.mark.parametrize('insertion_mode', ['exact', 'subsumes'])
+@pytest.mark.parametrize('matching', ['linear', 'interval'])
+@pytest.mark.parametrize('k', [1, 4])
+def test_debug_accounting_runs_and_does_not_change_learning(deletion_strategy, insertion_mode, matching, k):
+    # every change to the population is cross-checked against a full recount, which raises on a mismatch
+    populations = []
+
+    for debug in (False, True):
+        config = rmux.RMUXConfiguration()
+        config.deletion_strategy = deletion_strategy
+        config.insertion_mode = insertion_mode
+        config.matching = matching
+        config.debug_population_accounting = debug
+        populations.append(_train(config, k)._population.arrays())
+
+    for name in populations[0]:
+        np.testing.assert_array_equal(populations[1][name], populations[0][name], err_msg=name)
@@ -0,0 +1,72 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.sum_tree import SumTree
+
+import numpy as np
+
+
+def _tree(values):
+    tree = SumTree(len(values))
+
+    for i, value in enumerate(values):
+        tree.update(i, value)
+
+    return tree
+
+
+def test_updates_keep_every_prefix_sum():
+    rng = np.random.default_rng(0)
+    values = np.zeros(37)
+    tree = SumTree(len(values))
+
+    for _ in range(500):
+        i = int(rng.integers(len(values)))
+        values[i] = rng.uniform(0.0, 10.0) if rng.uniform() < 0.8 else 0.0
+        tree.update(i, values[i])
+
+    prefix_sums = np.concatenate(([0.0], np.cumsum(values)))
+    np.testing.assert_allclose([tree.prefix_sum(i) for i in range(len(values) + 1)], prefix_sums)
+    np.testing.assert_allclose(tree.total(), values.sum())
+
+
+def test_rebuild_matches_updates():
+    values = np.random.default_rng(1).uniform(size=50)
+    rebuilt = SumTree(len(values))
+    rebuilt.rebuild(values)
+    updated = _tree(values)
+
+    np.testing.assert_allclose([rebuilt.prefix_sum(i) for i in range(51)], [updated.prefix_sum(i) for i in range(51)])
+
+
+def test_find_inverts_the_prefix_sums_and_skips_zero_values():
+    values = np.array([0.0, 2.0, 0.0, 0.0, 1.0, 3.0, 0.0])
+    tree = _tree(values)
+
+    for x, index in [(0.0, 1), (1.999, 1), (2.0, 4), (2.5, 4), (3.0, 5), (5.999, 5)]:
+        assert tree.find(x) == index
+
+
+def test_sampling_is_proportional_to_the_values():
+    values = np.array([1.0, 0.0, 4.0, 2.0, 0.0, 3.0])
+    tree = _tree(values)
+    rng = np.random.default_rng(2)
+
+    samples = [tree.find(u * tree.total()) for u in rng.uniform(size=20000)]
+    frequencies = np.bincount(samples, minlength=len(values)) / len(samples)
+
+    np.testing.assert_allclose(frequencies, values / values.sum(), atol=0.01)
+    assert frequencies[1] == frequencies[4] == 0.0
+
+
+def test_resize_keeps_the_values():
+    tree = _tree([1.0, 2.0, 3.0])
+    tree.resize(8)
+    tree.update(6, 4.0)
+
+    assert len(tree) == 8
+    np.testing.assert_allclose([tree.prefix_sum(i) for i in range(9)], [0, 1, 3, 6, 6, 6, 6, 10, 10])
+
+    tree.resize(2)
+    np.testing.assert_allclose(tree.total(), 3.0)
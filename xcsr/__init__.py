@@ -3,7 +3,10 @@
 # 15 Sep. 2019
 
 from .classifier import Classifier 
+from .population import Population
+from .policy import Policy
 from .xcsr_driver import XCSRDriver
 from .environment import Environment
 from .configuration import Configuration
 from . import util
+from . import compaction
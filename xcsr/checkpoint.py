@@ -0,0 +1,96 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+import logging
+import os
+import pickle
+import threading
+
+
+def write_checkpoint(filename, snapshot):
+    # write to a temporary file first and move it over the old checkpoint, so that a process killed
+    # while writing leaves the previous checkpoint intact
+    temporary_filename = filename + '.tmp'
+
+    with open(temporary_filename, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temporary_filename, filename)
+
+
+def load_checkpoint(filename):
+    # the snapshot written by write_checkpoint, see XCSR.snapshot
+    with open(filename, 'rb') as f:
+        return pickle.load(f)
+
+
+class Checkpointer:
+    # takes a snapshot of an XCSR every interval calls to step, and writes it to filename on a background
+    # thread. taking the snapshot only copies the state, so training continues while it is written. if the
+    # writer falls behind, a snapshot still waiting to be written is replaced by the newer one
+
+    def __init__(self, filename, interval):
+        self.filename = filename
+        self.interval = interval
+        self._count = 0
+
+        # the snapshot waiting to be written, and the first error raised while writing
+        self._pending = None
+        self._error = None
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._write_snapshots, daemon=True)
+        self._thread.start()
+
+    def step(self, xcs_object, **progress):
+        # called once per step or episode. progress holds any state kept outside of xcs_object which is
+        # needed to resume, such as the episode number, and is stored in the snapshot under 'progress'
+        self._count += 1
+
+        if self._count % self.interval == 0:
+            self.save(xcs_object, **progress)
+
+    def save(self, xcs_object, **progress):
+        snapshot = xcs_object.snapshot()
+        snapshot['progress'] = progress
+
+        with self._condition:
+            self._raise_error()
+            self._pending = snapshot
+            self._condition.notify()
+
+    def close(self):
+        # wait for the last snapshot to be written
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError('could not write checkpoint {}'.format(self.filename)) from self._error
+
+    def _write_snapshots(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+
+                if self._pending is None:
+                    return
+
+                snapshot, self._pending = self._pending, None
+
+            try:
+                write_checkpoint(self.filename, snapshot)
+            except Exception as e:
+                logging.error('could not write checkpoint {}'.format(self.filename), exc_info=e)
+
+                with self._condition:
+                    self._error = self._error or e
@@ -10,16 +10,19 @@ class Classifier:
 	WILDCARD_ATTRIBUTE_VALUE = (PREDICATE_MIN, PREDICATE_MAX)
 	CLASSIFIER_ID = 0
 
+	__slots__ = ('_id', '_config', '_state_shape', 'bounds', 'action', 'predicted_payoff', 'epsilon',
+				'fitness', 'experience', 'last_time_step', 'action_set_size', 'numerosity')
+
 	def __init__(self, config, state_shape):
-		self._id = Classifier.CLASSIFIER_ID
-		Classifier.CLASSIFIER_ID += 1
+		self._id = Classifier.next_id()
 
 		self._config = config
 
 		self._state_shape = state_shape
 
-		# condition that specifies the sensory situation which the classifier applies to
-		self.predicate = [None for _ in range(self._state_shape[0])]
+		# condition that specifies the sensory situation which the classifier applies to, one
+		# (p_min, p_max) row per attribute. NaN until the predicate is set
+		self.bounds = np.full((self._state_shape[0], 2), np.nan)
 
 		# action the classifier proposes
 		self.action = None
@@ -45,6 +48,22 @@ class Classifier:
 		# number of micro-classifiers this classifier represents
 		self.numerosity = 1
 
+	@staticmethod
+	def next_id():
+		# a new, unique classifier id
+		classifier_id = Classifier.CLASSIFIER_ID
+		Classifier.CLASSIFIER_ID += 1
+		return classifier_id
+
+	@property
+	def predicate(self):
+		# the bounds as a list of (p_min, p_max) tuples
+		return [tuple(interval) for interval in self.bounds.tolist()]
+
+	@predicate.setter
+	def predicate(self, predicate):
+		self.bounds = np.array(predicate, dtype=np.float64).reshape(self._state_shape[0], 2)
+
 	def __str__(self):
 		s = '\nid: {id}\n\tpredicate: {cond}, action: {act}\n\tpred:\t{pred} \
 				\n\terror:\t{err}\n\tfit:\t{fit} \
@@ -61,47 +80,53 @@ class Classifier:
 		return self.predicted_payoff < other.predicted_payoff
 
 	def copy(self):
-		other = Classifier(self._config, self._state_shape)
-		other.__dict__ = self.__dict__
+		# a new classifier with its own id and bounds, and the same action and estimates as this one
+		other = Classifier.__new__(Classifier)
+		other._id = Classifier.next_id()
+		other._config, other._state_shape = self._config, self._state_shape
+		other.bounds = self.bounds.copy()
+		other.action = self.action
+		other.predicted_payoff, other.epsilon, other.fitness = self.predicted_payoff, self.epsilon, self.fitness
+		other.experience, other.last_time_step = self.experience, self.last_time_step
+		other.action_set_size, other.numerosity = self.action_set_size, self.numerosity
 		return other
 
-	def set_predicates(self, sigma):
-		for i in range(self._state_shape[0]):
-			if np.random.uniform() < self._config.p_sharp:
-				self.predicate[i] = self.WILDCARD_ATTRIBUTE_VALUE
-			else:
-				h = self._config.predicate_1
-				p_min = sigma[i] - np.random.uniform(high=h)
-				p_max = sigma[i] + np.random.uniform(high=h)
-				self.force_set_predicate_i(i, p_min, p_max)
+	def set_predicates(self, sigma, rng=None):
+		# rng is an XCSR's BlockRNG, or the global NumPy RNG by default
+		rng = np.random if rng is None else rng
+		num_attributes, h = self._state_shape[0], self._config.predicate_1
+
+		# draw every attribute's random numbers at once
+		wildcards = rng.uniform(size=num_attributes) < self._config.p_sharp
+		p_min = np.asarray(sigma) - rng.uniform(high=h, size=num_attributes)
+		p_max = np.asarray(sigma) + rng.uniform(high=h, size=num_attributes)
+
+		# assigned whole, so that a ClassifierView writes them through to its population
+		self.bounds = np.stack((np.where(wildcards, self.PREDICATE_MIN, np.minimum(p_min, p_max)),
+								np.where(wildcards, self.PREDICATE_MAX, p_max)), axis=1)
 
 	def force_set_predicate_i(self, i, p_min, p_max):
 		# p_max = min(self.PREDICATE_MAX, p_max)
 		# p_min = max(self.PREDICATE_MIN, p_min)
 		p_min = min(p_max, p_min)
-		self.predicate[i] = p_min, p_max
+		self.bounds[i] = p_min, p_max
 
 	def matches_sigma(self, sigma):
-		items = zip(self.predicate, sigma)
-		m = map(lambda x: x[0][0] <= x[1] <= x[0][1], items)
-		return all(m)
+		return bool(((self.bounds[:, 0] <= sigma) & (sigma <= self.bounds[:, 1])).all())
 
 	def does_subsume(self, other):
 		# if self and other have the same action, if self is allowed to subsume and is self is more general than other
 		return self.action == other.action and self.could_subsume() and self.is_more_general(other)
 
 	def predicate_subsumes(self, other):
-		for (s_p_min, s_p_max), (o_p_min, o_p_max) in zip(self.predicate, other.predicate):
-			if o_p_min < s_p_min or o_p_max > s_p_max:
-				return False
-		return True
+		return bool(((self.bounds[:, 0] <= other.bounds[:, 0]) & (other.bounds[:, 1] <= self.bounds[:, 1])).all())
 
 	def is_more_general(self, other):
 		# for each attribute index i in the classifiers condition
 		for i in range(self._state_shape[0]):
-			# if the condition for cl_gen is not the wildcard nd cl_gen condition[i] does not match cl_spec condition[i]
-			if self.predicate[i] != Classifier.WILDCARD_ATTRIBUTE_VALUE and \
-					(self.predicate[0] > other.predicate[0] or self.predicate[1] < other.predicate[1]):
+			# if the condition for cl_gen is not the wildcard and cl_gen condition[i] does not contain cl_spec condition[i]
+			if tuple(self.bounds[i]) != Classifier.WILDCARD_ATTRIBUTE_VALUE and \
+					(self.bounds[i, 0] > other.bounds[i, 0] or self.bounds[i, 1] < other.bounds[i, 1]):
 				# then cl_gen is not more general than cl_spec
 				return False
 
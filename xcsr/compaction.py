@@ -0,0 +1,231 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+# post-training compaction of a population into a small rule set which is cheap to evaluate. compact()
+# runs three stages, each returning a new population and leaving its input untouched:
+#
+#   filter_population  drops the classifiers which are inexperienced or inaccurate
+#   merge_subsumed     folds every classifier into a more general, accurate one with the same action
+#   greedy_cover       keeps a small set of classifiers which still decides every validation state the
+#                      way the whole population does, picked greedily (after Wilson's compact ruleset
+#                      algorithm)
+#
+# and reports the size of the population after each stage, and its coverage and accuracy on the
+# validation states before and after compaction.
+#
+#   python -m xcsr.compaction classifiers/replication0.xpop compact0.xpop --validation validation.npz
+
+from xcsr.configuration import Configuration
+from xcsr.population import Population, is_more_general
+from xcsr.policy import Policy
+
+import argparse
+import copy
+import json
+import numpy as np
+
+
+# relative tolerance of the comparison between a classifier's prediction and the prediction array
+COVER_TOLERANCE = 1e-9
+
+
+def compact(population, states=None, payoffs=None, min_experience=None, max_error=None, config=None):
+    # the compacted population and a report of every stage. population is a Population, a list of
+    # classifiers or a population file. states is a (B, d) validation stream, without it the greedy cover
+    # is skipped. payoffs holds the (B, num_actions) payoff of every action in each state, see
+    # validation_stream, and adds accuracy to the report. the thresholds default to the subsumption
+    # thresholds theta_sub and epsilon_0 of the configuration
+    population = as_population(population, config)
+    config = population.config
+    min_experience = config.theta_sub if min_experience is None else min_experience
+    max_error = config.epsilon_0 if max_error is None else max_error
+
+    report = {'min_experience': min_experience, 'max_error': max_error, 'stages': [_size('input', population)]}
+    compacted = filter_population(population, min_experience, max_error)
+    report['stages'].append(_size('filter', compacted))
+
+    compacted = merge_subsumed(compacted)
+    report['stages'].append(_size('merge', compacted))
+
+    if states is not None:
+        compacted = greedy_cover(compacted, states)
+        report['stages'].append(_size('cover', compacted))
+
+        report['before'] = evaluate(population, states, payoffs)
+        report['after'] = evaluate(compacted, states, payoffs)
+
+        # fraction of the validation states compacted population decides the same way as the input
+        report['agreement'] = float(np.mean(Policy(population).predict_action_ids(states) ==
+                                            Policy(compacted).predict_action_ids(states)))
+
+    return compacted, report
+
+
+def as_population(population, config=None):
+    # population as a Population. a string is read as a population file, a list of classifiers is copied
+    # into a new population whose actions are the distinct actions of the classifiers, in sorted order
+    if isinstance(population, Population):
+        return population
+
+    if isinstance(population, str):
+        return Population.load(population, config)
+
+    config = config or Configuration()
+    state_shape = (len(population[0].bounds),) if len(population) > 0 else (0,)
+    result = Population(config, state_shape, sorted({cl.action for cl in population}), capacity=len(population))
+
+    for cl in population:
+        result.add(cl.copy())
+
+    return result
+
+
+def select(population, rows, **columns):
+    # a new population holding the given rows of population. columns replaces whole columns of population
+    # before the rows are taken
+    arrays = dict(population.arrays(), **columns)
+    arrays = {name: np.array(array[rows]) for name, array in arrays.items()}
+    return Population.from_arrays(population.config, population.state_shape, population.possible_actions, arrays)
+
+
+def filter_population(population, min_experience, max_error):
+    # the classifiers with an experience of at least min_experience and an error of at most max_error
+    keep = (population.experience >= min_experience) & (population.epsilon <= max_error)
+    return select(population, np.flatnonzero(keep))
+
+
+def merge_subsumed(population):
+    # every classifier which a classifier with the same action could subsume (see Classifier.could_subsume)
+    # is more general than is removed, and its numerosity added to the most general such classifier
+    lower, upper = population.lower, population.upper
+    numerosity = np.array(population.numerosity)
+    rows = np.arange(len(population))
+    kept = np.ones(len(population), dtype=bool)
+
+    could_subsume = population.could_subsume(rows)
+
+    # most general first, by the total width of the intervals within the predicate range
+    order = np.argsort(-population.generality(rows), kind='stable')
+
+    for row in order[could_subsume[order]]:
+        if not kept[row]:
+            continue
+
+        subsumed = kept & (population.action_id == population.action_id[row]) & \
+            is_more_general(lower[row], upper[row], lower, upper)
+        subsumed[row] = False
+
+        numerosity[row] += numerosity[subsumed].sum()
+        kept[subsumed] = False
+
+    return select(population, np.flatnonzero(kept), numerosity=numerosity)
+
+
+def greedy_cover(population, states):
+    # a subset of the population covering every validation state some classifier matches. a state is
+    # covered by a classifier which matches it, advocates the action the whole population chooses in it
+    # and predicts at least the payoff the population predicts for that action, so that overgeneral
+    # classifiers whose prediction is dragged down by the states they should not match do not cover it.
+    # the classifier covering the most uncovered states is taken until all are covered, ties going to the
+    # greatest fitness times numerosity
+    states = np.atleast_2d(np.asarray(states, dtype=np.float64))
+    policy = Policy(population)
+    predictions = policy.prediction_array(states)
+    chosen = policy.action_ids(predictions)
+
+    # the prediction array is a fitness weighted mean, at least one of its terms is not below it
+    # (up to rounding)
+    chosen_prediction = predictions[np.arange(len(states)), chosen]
+    chosen_prediction -= COVER_TOLERANCE * np.maximum(np.abs(chosen_prediction), 1.0)
+
+    covers = np.empty((len(states), len(population)), dtype=bool)
+
+    for start in range(0, len(states), policy.chunk_size):
+        chunk = slice(start, start + policy.chunk_size)
+        covers[chunk] = policy.match(states[chunk]) & (population.action_id == chosen[chunk, None]) & \
+            (population.predicted_payoff >= chosen_prediction[chunk, None])
+
+    strength = population.fitness * population.numerosity
+    uncovered = covers.any(axis=1)
+    selected = []
+
+    while uncovered.any():
+        counts = covers[uncovered].sum(axis=0)
+        candidates = np.flatnonzero(counts == counts.max())
+        best = candidates[np.argmax(strength[candidates])]
+
+        selected.append(best)
+        uncovered &= ~covers[:, best]
+
+    return select(population, np.sort(np.array(selected, dtype=np.int64)))
+
+
+def evaluate(population, states, payoffs=None):
+    # size of population and the fraction of the states it matches. with payoffs, also the fraction of
+    # states in which it chooses an action with the highest payoff (unmatched states count as wrong),
+    # the mean payoff of the chosen actions and the mean absolute error of their predictions
+    states = np.atleast_2d(np.asarray(states, dtype=np.float64))
+    policy = Policy(population)
+    predictions = policy.prediction_array(states)
+    action_ids = policy.action_ids(predictions)
+    matched = action_ids >= 0
+
+    result = _size(None, population)
+    result['coverage'] = float(matched.mean()) if len(states) > 0 else 0.0
+
+    if payoffs is not None:
+        payoffs = np.asarray(payoffs, dtype=np.float64)
+        states_matched = np.flatnonzero(matched)
+        payoff = payoffs[states_matched, action_ids[matched]]
+
+        result['accuracy'] = float(np.sum(payoff == payoffs[matched].max(axis=1)) / max(len(states), 1))
+        result['mean_payoff'] = float(payoff.mean()) if len(payoff) > 0 else 0.0
+        result['prediction_error'] = float(np.abs(predictions[states_matched, action_ids[matched]] - payoff)
+                                           .mean()) if len(payoff) > 0 else 0.0
+
+    return result
+
+
+def validation_stream(env, count):
+    # count states from the batched interface of a single-step environment, and the (count, num_actions)
+    # payoff of every action in each of them. the states are drawn from env, the actions are committed
+    # in copies of it
+    states = np.array(env.get_states(count), dtype=np.float64)
+    payoffs = np.empty((count, len(env.possible_actions)))
+
+    for i, action in enumerate(env.possible_actions):
+        payoffs[:, i] = copy.deepcopy(env).step_batch([action] * count)
+
+    return states, payoffs
+
+
+def _size(stage, population):
+    size = {'classifiers': len(population), 'microclassifiers': int(population.total_numerosity)}
+
+    if stage is not None:
+        size['stage'] = stage
+
+    return size
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='compact a saved population')
+    parser.add_argument('population', help='population file written by Population.save')
+    parser.add_argument('output', help='file the compacted population is written to')
+    parser.add_argument('--validation', help='.npz file holding the validation states, and optionally '
+                                             'their payoffs, see validation_stream')
+    parser.add_argument('--min-experience', type=int)
+    parser.add_argument('--max-error', type=float)
+    args = parser.parse_args()
+
+    states = payoffs = None
+
+    if args.validation is not None:
+        with np.load(args.validation) as validation:
+            states = validation['states']
+            payoffs = validation['payoffs'] if 'payoffs' in validation else None
+
+    compacted, compaction_report = compact(args.population, states, payoffs, args.min_experience, args.max_error)
+    compacted.save(args.output)
+    print(json.dumps(compaction_report, indent=2))
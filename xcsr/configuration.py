@@ -67,3 +67,50 @@ class Configuration:
         # boolean parameter. specifies if offspring are to be tested
         # for possible subsumption by parents
         self.do_ga_subsumption = True
+
+        # boolean parameter. specifies if action sets are to be tested for subsuming classifiers
+        # after they are updated
+        self.do_action_set_subsumption = False
+
+        # number of pairs of offspring produced each time the GA runs on an action set
+        self.ga_offspring_pairs = 1
+
+        # how classifiers are chosen for deletion once the population is full. 'beta' selects by a
+        # beta-distributed rank in predicted payoff or uniformly at random, 'vote' selects proportionally
+        # to each classifier's deletion vote (action set size times numerosity, with a fitness correction)
+        self.deletion_strategy = 'beta'
+
+        # deletion threshold. experience of a classifier must be greater than theta_del
+        # for its fitness to be taken into account in its deletion vote
+        self.theta_del = 20
+
+        # fraction of the mean fitness of the population below which
+        # the fitness of a classifier increases its deletion vote
+        self.delta = 0.1
+
+        # how a new offspring is matched against the population before being inserted. 'exact' looks up a
+        # classifier with the same action and predicate in a hash index, 'subsumes' scans the population
+        # for any classifier with the same action whose predicate contains the offspring's predicate
+        self.insertion_mode = 'exact'
+
+        # when not 0, predicate bounds are quantized to multiples of duplicate_tolerance
+        # before 'exact' insertion compares them
+        self.duplicate_tolerance = 0.0
+
+        # how the match set is found. 'linear' tests sigma against every classifier at once, 'interval'
+        # intersects per-dimension bitsets of bucketed interval endpoints and only tests the classifiers
+        # that survive the intersection.
+        # see benchmarks/interval_index.py for where the index starts to pay off
+        self.matching = 'linear'
+
+        # number of problems (single-step), batches (lockstep) or episodes (multi-step) between checkpoints
+        # written by XCSRDriver, from which it can resume a replication. 0 disables checkpointing
+        self.checkpoint_interval = 0
+
+        # boolean parameter. measures the time and number of calls of every phase of the learning loop,
+        # see XCSR.get_profile. XCSRDriver saves them next to metadata.json
+        self.profile_phases = False
+
+        # boolean parameter. cross-checks the population's incrementally maintained
+        # aggregates (numerosity and fitness totals) against a full recount on every change
+        self.debug_population_accounting = False
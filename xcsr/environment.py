@@ -2,7 +2,9 @@
 # Auburn University - CSSE
 # july 12 2019
 
+import copy
 import logging
+import numpy as np
 
 
 class Environment:
@@ -18,6 +20,9 @@ class Environment:
         self._max_steps = config.steps_per_episode
         self._state = None
 
+        # the other instances stepped alongside this one by the default batched interface
+        self._batch_instances = []
+
     def get_state(self):
         raise NotImplementedError()
 
@@ -27,6 +32,31 @@ class Environment:
     def step(self, action):
         raise NotImplementedError()
 
+    def get_states(self, k):
+        # batched interface: the (k, d) states of k instances of this environment. the default implementation
+        # keeps k - 1 other instances (see new_instance) alongside this one and loops over their scalar methods
+        if len(self._batch_instances) != k - 1:
+            self._batch_instances = []
+            self._batch_instances = [self.new_instance() for _ in range(k - 1)]
+
+        instances = [self] + self._batch_instances
+        return np.array([env.get_state() for env in instances], dtype=np.float64)
+
+    def step_batch(self, actions):
+        # batched interface: commit one action in each of the instances returned by get_states and
+        # return their (k,) payoffs. each instance advances its own time_step and end_of_program
+        instances = [self] + self._batch_instances
+        return np.array([env.step(action) for env, action in zip(instances, actions)], dtype=np.float64)
+
+    def new_instance(self):
+        # another instance of this environment for the default batched interface. the default deep-copies
+        # this environment and resets the copy, so that it starts from a state of its own rather than this
+        # environment's current one. environments whose reset does not draw a new state override this
+        instance = copy.deepcopy(self)
+        instance._batch_instances = []
+        instance.reset()
+        return instance
+
     def reset(self):
         self.end_of_program = False
         self.time_step = 0
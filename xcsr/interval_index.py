@@ -0,0 +1,76 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.classifier import Classifier
+
+import numpy as np
+
+
+class IntervalIndex:
+    # bucketed interval endpoints with bitset intersection over the hyper-rectangles of a Population.
+    #
+    # each dimension of the predicate space is cut into equal-width buckets, and every (dimension, bucket)
+    # pair holds a bitset with one bit per population row, set when the row's interval in that dimension
+    # overlaps the bucket. the classifiers matching sigma are a subset of the rows whose bit is set in the
+    # bucket holding sigma[j] for every dimension j, so a query ANDs d packed bitsets, and only tests the
+    # surviving candidate rows against sigma. bitsets are updated in place when a row changes
+
+    BUCKETS = 32
+
+    def __init__(self, population, buckets=BUCKETS):
+        self._population = population
+        self._buckets = buckets
+        self._min, self._max = Classifier.PREDICATE_MIN, Classifier.PREDICATE_MAX
+
+        # (d, buckets, bytes) packed bitsets, bit r of a bitset stands for population row r
+        self._bits = np.zeros((population.state_shape[0], buckets, 0), dtype=np.uint8)
+
+        for row in range(len(population)):
+            self.on_change(row)
+
+    def _bucket(self, x):
+        # bucket of each value in x. values outside the predicate range fall into the outermost buckets
+        bucket = np.floor((np.asarray(x, dtype=np.float64) - self._min) / (self._max - self._min) * self._buckets)
+        return np.clip(bucket, 0, self._buckets - 1).astype(np.int64)
+
+    def on_change(self, row):
+        # the bounds in row were added or changed
+        byte, bit = row >> 3, np.uint8(1 << (row & 7))
+
+        if byte >= self._bits.shape[2]:
+            self._grow(byte + 1)
+
+        # buckets overlapped by the interval in each dimension
+        first = self._bucket(self._population.lower[row])
+        last = self._bucket(self._population.upper[row])
+        buckets = np.arange(self._buckets)
+        overlaps = (buckets >= first[:, None]) & (buckets <= last[:, None])
+
+        column = self._bits[:, :, byte]
+        self._bits[:, :, byte] = np.where(overlaps, column | bit, column & ~bit)
+
+    def on_remove(self, row):
+        # row no longer holds a classifier
+        self._bits[:, :, row >> 3] &= ~np.uint8(1 << (row & 7))
+
+    def query(self, sigma):
+        # rows of all classifiers whose predicate matches sigma, in ascending order
+        sigma = np.asarray(sigma, dtype=np.float64)
+        population = self._population
+        num_bytes = (len(population) + 7) >> 3
+
+        # AND together the bitset of sigma's bucket in every dimension
+        bitsets = self._bits[np.arange(len(sigma)), self._bucket(sigma), :num_bytes]
+        candidates = np.bitwise_and.reduce(bitsets, axis=0)
+        candidates = np.flatnonzero(np.unpackbits(candidates, bitorder='little')[:len(population)])
+
+        # test the candidates against sigma
+        lower, upper = population.lower[candidates], population.upper[candidates]
+        return candidates[((lower <= sigma) & (sigma <= upper)).all(axis=1)]
+
+    def _grow(self, num_bytes):
+        # amortized doubling, like the population arrays
+        bits = np.zeros(self._bits.shape[:2] + (max(num_bytes, 2 * self._bits.shape[2]),), dtype=np.uint8)
+        bits[:, :, :self._bits.shape[2]] = self._bits
+        self._bits = bits
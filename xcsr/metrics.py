@@ -0,0 +1,174 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+import numpy as np
+
+
+# the metrics recorded by XCSR at every step
+METRICS = ('rhos', 'predicted_rhos', 'microclassifier_counts')
+
+
+class MetricsHistory:
+    # keeps all rewards, expected rewards and the number of microclassifiers in memory. every metrics sink
+    # has the methods of this class, read returns the metrics recorded so far in the form of history
+
+    def __init__(self):
+        self.history = {}
+        self.reset()
+
+    def reset(self):
+        self.history = {'rhos': [], 'predicted_rhos': [], 'microclassifier_counts': [], 'steps': 0}
+
+    def record(self, rho, predicted_rho, microclassifier_count):
+        self.history['rhos'].append(rho)
+        self.history['predicted_rhos'].append(predicted_rho)
+        self.history['microclassifier_counts'].append(microclassifier_count)
+        self.history['steps'] += 1
+
+    def read(self):
+        return self.history
+
+    def snapshot(self):
+        return {'history': {key: list(value) if isinstance(value, list) else value
+                            for key, value in self.history.items()}}
+
+    def restore(self, snapshot):
+        self.history = snapshot['history']
+
+    def close(self):
+        pass
+
+
+class AppendableNpy:
+    # a one-dimensional .npy file which grows as values are appended. the header is written with a
+    # fixed size, and rewritten with the new length after every append, so the file can be opened
+    # with np.load (or memory-mapped) at any time and shows every value flushed so far
+
+    HEADER_SIZE = 128
+
+    def __init__(self, filename, dtype=np.float64, resume=False):
+        # with resume, an existing file is opened and appended to instead of being emptied
+        self.filename = filename
+        self.dtype = np.dtype(dtype)
+
+        if resume:
+            self._file = open(filename, 'rb+')
+            np.lib.format.read_magic(self._file)
+            self._length = np.lib.format.read_array_header_1_0(self._file)[0][0]
+        else:
+            self._file = open(filename, 'wb+')
+            self.reset()
+
+    def __len__(self):
+        return self._length
+
+    def read(self):
+        # every value appended so far, memory-mapped
+        if self._length == 0:
+            return np.empty(0, dtype=self.dtype)
+
+        return np.load(self.filename, mmap_mode='r')
+
+    def reset(self):
+        self._length = 0
+        self._file.truncate(0)
+        self._write_header()
+
+    def truncate(self, length):
+        # drop every value after the first length
+        self._length = min(length, self._length)
+        self._file.truncate(self.HEADER_SIZE + self._length * self.dtype.itemsize)
+        self._write_header()
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._file.seek(self.HEADER_SIZE + self._length * self.dtype.itemsize)
+        self._file.write(values.tobytes())
+        self._length += len(values)
+        self._write_header()
+
+    def close(self):
+        self._file.close()
+
+    def _write_header(self):
+        header = "{{'descr': '{}', 'fortran_order': False, 'shape': ({},), }}".format(
+            np.lib.format.dtype_to_descr(self.dtype), self._length)
+
+        # magic string and version 1.0, then the header length, then the space padded header
+        preamble = np.lib.format.magic(1, 0)
+        padding = self.HEADER_SIZE - len(preamble) - 2 - len(header) - 1
+        header = header + ' ' * padding + '\n'
+
+        self._file.seek(0)
+        self._file.write(preamble + np.uint16(len(header)).astype('<u2').tobytes() + header.encode('latin1'))
+        self._file.flush()
+
+
+class MetricsWriter:
+    # streams the metrics of a replication into one appendable .npy file per metric. values are
+    # buffered in fixed-size chunks which are flushed to disk when full, so memory use stays constant
+    # however long the run is. the step count is written to its own file when the writer is closed
+
+    CHUNK_SIZE = 4096
+
+    def __init__(self, filenames, chunk_size=CHUNK_SIZE, dtype=np.float64, resume=False):
+        # filenames maps each metric in METRICS, and 'steps', to the file it is written to. with resume,
+        # existing files are appended to, see restore
+        self._steps_filename = filenames['steps']
+        self._files = {key: AppendableNpy(filenames[key], dtype, resume) for key in METRICS}
+        self._chunks = {key: np.empty(chunk_size, dtype=dtype) for key in METRICS}
+        self._position = 0
+        self.steps = 0
+
+    def reset(self):
+        self._position = 0
+        self.steps = 0
+
+        for data in self._files.values():
+            data.reset()
+
+    def record(self, rho, predicted_rho, microclassifier_count):
+        position = self._position
+        self._chunks['rhos'][position] = rho
+        self._chunks['predicted_rhos'][position] = predicted_rho
+        self._chunks['microclassifier_counts'][position] = microclassifier_count
+        self._position += 1
+        self.steps += 1
+
+        if self._position == len(self._chunks['rhos']):
+            self.flush()
+
+    def read(self):
+        # the metrics recorded so far, flushed and memory-mapped from their files, and the step count
+        self.flush()
+        history = {key: data.read() for key, data in self._files.items()}
+        history['steps'] = self.steps
+        return history
+
+    def snapshot(self):
+        # everything recorded so far is flushed, so the snapshot only needs the length of the files
+        self.flush()
+        return {'lengths': {key: len(data) for key, data in self._files.items()}, 'steps': self.steps}
+
+    def restore(self, snapshot):
+        # drop the values recorded after snapshot was taken
+        for key, data in self._files.items():
+            data.truncate(snapshot['lengths'][key])
+
+        self._position = 0
+        self.steps = snapshot['steps']
+
+    def flush(self):
+        for key, data in self._files.items():
+            data.append(self._chunks[key][:self._position])
+
+        self._position = 0
+
+    def close(self):
+        self.flush()
+
+        for data in self._files.values():
+            data.close()
+
+        np.save(self._steps_filename, np.array([self.steps], dtype=np.float64))
@@ -0,0 +1,158 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+from xcsr.population import read_population_arrays
+
+import numpy as np
+
+
+class Policy:
+    # a frozen, read-only policy over a trained population. the bounds and the per-action payoff and fitness
+    # of every classifier are copied into contiguous arrays when the policy is built, and batches of states
+    # are scored against all of them at once. a policy never covers, learns or explores: states no classifier
+    # matches get no prediction, and the action chosen for a state is always the one XCSR would exploit
+
+    # number of states matched at once, bounds the (states x classifiers) match matrix
+    CHUNK_SIZE = 1024
+
+    # prefix bitsets take about d * (n + 1) * n / 4 bytes. above this size, states are matched by
+    # comparing them against every bound instead
+    PREFIX_BITSET_LIMIT = 64 * 2 ** 20
+
+    def __init__(self, population, chunk_size=CHUNK_SIZE):
+        self._build(population.possible_actions, population.state_shape, population.arrays(), chunk_size)
+
+    @classmethod
+    def from_arrays(cls, possible_actions, state_shape, arrays, chunk_size=CHUNK_SIZE):
+        # a policy over the rows in arrays, as returned by Population.arrays
+        policy = cls.__new__(cls)
+        policy._build(possible_actions, state_shape, arrays, chunk_size)
+        return policy
+
+    def _build(self, possible_actions, state_shape, arrays, chunk_size):
+        self.possible_actions = list(possible_actions)
+        self.state_shape = tuple(state_shape)
+        self.chunk_size = chunk_size
+        num_actions = len(self.possible_actions)
+
+        # (d, n) bounds, so that matching a chunk against one dimension reads a contiguous row
+        self._lower = _frozen(np.asarray(arrays['lower']).T)
+        self._upper = _frozen(np.asarray(arrays['upper']).T)
+
+        # with every dimension's lower bounds sorted, the classifiers whose lower bound is at most sigma[j]
+        # are a prefix of the sorted order, found by binary search. one packed bitset per prefix length
+        # turns matching into 2 * d bitset lookups and ANDs. upper bounds are negated to sort the same way
+        self._thresholds, self._prefix_bits = None, None
+        d, n = self._lower.shape
+
+        if d * (n + 1) * (n + 7) // 4 <= self.PREFIX_BITSET_LIMIT:
+            bounds = np.stack((self._lower, -self._upper), axis=1)
+            self._thresholds = _frozen(np.sort(bounds, axis=2))
+            self._prefix_bits = np.empty((d, 2, n + 1, (n + 7) // 8), dtype=np.uint8)
+
+            # row k of a (n + 1, n) lower triangle marks the first k classifiers in sorted order
+            prefixes = np.tri(n + 1, n, -1, dtype=bool)
+
+            for j in range(d):
+                for side in range(2):
+                    rank = np.argsort(np.argsort(bounds[j, side], kind='stable'), kind='stable')
+                    self._prefix_bits[j, side] = np.packbits(prefixes[:, rank], axis=1, bitorder='little')
+
+            self._prefix_bits.flags.writeable = False
+
+        # (n, 3 * num_actions) one-hot matrix holding each classifier's fitness weighted payoff, fitness and
+        # a 1 in its action's column of each block. a match matrix times it sums all three per action
+        rows, action_ids = np.arange(n), np.asarray(arrays['action_id'])
+        fitness = np.asarray(arrays['fitness'])
+        weights = np.zeros((n, 3 * num_actions))
+        weights[rows, action_ids] = np.asarray(arrays['predicted_payoff']) * fitness
+        weights[rows, num_actions + action_ids] = fitness
+        weights[rows, 2 * num_actions + action_ids] = 1.0
+        self._weights = _frozen(weights)
+
+        # action ids ordered by descending action, ties between predictions go to the greatest action
+        self._tie_break_order = np.array(sorted(range(num_actions), key=lambda i: self.possible_actions[i],
+                                                reverse=True), dtype=np.int64)
+
+    @classmethod
+    def load(cls, filename, chunk_size=CHUNK_SIZE):
+        # a policy over the population saved in filename, see Population.save. the columns are read straight
+        # from the memory-mapped file, no Population is built
+        state_shape, actions, arrays = read_population_arrays(filename, mmap_mode='r')
+        return cls.from_arrays(actions, state_shape, arrays, chunk_size)
+
+    def __len__(self):
+        # number of classifiers in the policy
+        return self._lower.shape[1]
+
+    def match(self, states):
+        # (B, n) boolean matrix, true where classifier j matches state i
+        states = np.asarray(states, dtype=np.float64)
+
+        if self._prefix_bits is not None:
+            bits = None
+
+            for j in range(self._lower.shape[0]):
+                for side, sigma in enumerate((states[:, j], -states[:, j])):
+                    prefix = self._prefix_bits[j, side, np.searchsorted(self._thresholds[j, side], sigma, 'right')]
+                    bits = prefix if bits is None else np.bitwise_and(bits, prefix, out=bits)
+
+            return np.unpackbits(bits, axis=1, count=len(self), bitorder='little').view(bool)
+
+        mask = np.ones((len(states), len(self)), dtype=bool)
+
+        for j in range(self._lower.shape[0]):
+            sigma = states[:, j, None]
+            mask &= self._lower[j] <= sigma
+            mask &= sigma <= self._upper[j]
+
+        return mask
+
+    def prediction_array(self, states):
+        # (B, num_actions) prediction arrays of a (B, d) batch of states, the fitness weighted payoff the
+        # matching classifiers predict for each action. NaN where no matching classifier advocates the action
+        states = np.atleast_2d(np.asarray(states, dtype=np.float64))
+        num_actions = len(self.possible_actions)
+        predictions = np.empty((len(states), num_actions))
+
+        for start in range(0, len(states), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            sums = self.match(states[chunk]).astype(np.float64) @ self._weights
+
+            payoff, fitness = sums[:, :num_actions], sums[:, num_actions:2 * num_actions]
+            advocated = sums[:, 2 * num_actions:] > 0
+
+            # divide by the fitness sum of each action whose fitness sum is not zero
+            np.divide(payoff, fitness, out=payoff, where=fitness != 0)
+            predictions[chunk] = np.where(advocated, payoff, np.nan)
+
+        return predictions
+
+    def predict_action_ids(self, states):
+        # (B,) ids of the actions with the highest prediction, -1 for states no classifier matches
+        return self.action_ids(self.prediction_array(states))
+
+    def action_ids(self, predictions):
+        # (B,) ids of the actions with the highest prediction in a batch of prediction arrays, -1 where
+        # no action has a prediction
+        predictions = np.asarray(predictions)[:, self._tie_break_order]
+        unmatched = np.isnan(predictions).all(axis=1)
+
+        # argmax returns the first of equal maxima, which is the greatest action in tie break order
+        best = np.nan_to_num(predictions, nan=-np.inf).argmax(axis=1)
+        action_ids = self._tie_break_order[best]
+        action_ids[unmatched] = -1
+
+        return action_ids
+
+    def predict(self, states):
+        # the action chosen for each state in a (B, d) batch, None for states no classifier matches
+        return [self.possible_actions[i] if i >= 0 else None for i in self.predict_action_ids(states)]
+
+
+def _frozen(array):
+    # a read-only, C-contiguous copy of array
+    array = np.array(array, dtype=np.float64, order='C')
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,85 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+import time
+
+
+class PhaseProfiler:
+    # wall clock time and number of calls of every phase of the learning loop. a phase is timed by
+    #
+    #   with profiler.phase('match'):
+    #       ...
+    #
+    # times are inclusive: match includes the covering it triggers, covering includes the deletion that
+    # follows each covering classifier, and ga includes the insertion and deletion of its children.
+    # loop times a whole call of run_experiment or run_lockstep. the summary adds an unaccounted entry, the
+    # part of the loop outside every top-level phase, so that a cost no phase covers still shows up.
+    # a disabled profiler hands out one shared timer which does nothing, so that the phases can stay in
+    # the learning loop at the cost of an empty with statement
+
+    PHASES = ('match', 'covering', 'prediction', 'action_selection', 'environment_step', 'update', 'ga',
+              'insertion', 'deletion', 'metrics', 'checkpoint', 'loop')
+
+    # phases timed inside other phases, and the loop all others are timed in
+    NESTED_PHASES = ('covering', 'insertion', 'deletion')
+    LOOP_PHASE = 'loop'
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+
+        if enabled:
+            self._timers = {name: _PhaseTimer() for name in self.PHASES}
+        else:
+            self._timers = dict.fromkeys(self.PHASES, _NULL_TIMER)
+
+    def phase(self, name):
+        return self._timers[name]
+
+    def summary(self):
+        # total and mean seconds and number of calls of every phase and of the unaccounted loop time, None if
+        # the profiler is disabled
+        if not self.enabled:
+            return None
+
+        summary = {name: _entry(timer.total, timer.calls) for name, timer in self._timers.items()}
+
+        loop = self._timers[self.LOOP_PHASE]
+        accounted = sum(timer.total for name, timer in self._timers.items()
+                        if name not in self.NESTED_PHASES and name != self.LOOP_PHASE)
+        summary['unaccounted'] = _entry(max(loop.total - accounted, 0.0), loop.calls)
+
+        return summary
+
+
+def _entry(total, calls):
+    return {'calls': calls, 'total_seconds': total, 'mean_seconds': total / calls if calls > 0 else 0.0}
+
+
+class _PhaseTimer:
+    __slots__ = ('total', 'calls', '_start')
+
+    def __init__(self):
+        self.total = 0.0
+        self.calls = 0
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.total += time.perf_counter() - self._start
+        self.calls += 1
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
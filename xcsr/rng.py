@@ -0,0 +1,67 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+import numpy as np
+
+
+class BlockRNG:
+    # a np.random.Generator whose uniform numbers are drawn in blocks and handed out by a cursor, so that
+    # the scalar draws of the learning loop cost a list lookup rather than a call into the generator.
+    # uniform() takes the same arguments as np.random.uniform, so either can be passed where a classifier
+    # needs random numbers
+
+    BLOCK_SIZE = 4096
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        # seed is anything np.random.default_rng accepts, such as an int or a spawned np.random.SeedSequence
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+
+        # the current block as python floats, and the position of the next unused number in it
+        self._block = []
+        self._cursor = 0
+
+    def random(self):
+        # a uniform number in [0, 1)
+        if self._cursor == len(self._block):
+            self._block = self.generator.random(self.block_size).tolist()
+            self._cursor = 0
+
+        value = self._block[self._cursor]
+        self._cursor += 1
+        return value
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        if size is None:
+            return low + (high - low) * self.random()
+
+        # the same numbers as size calls to random(), taken from the block in slices
+        count = int(np.prod(size))
+        values = self._block[self._cursor:self._cursor + count]
+        self._cursor += len(values)
+
+        while len(values) < count:
+            self._block = self.generator.random(self.block_size).tolist()
+            self._cursor = min(count - len(values), self.block_size)
+            values += self._block[:self._cursor]
+
+        return low + (high - low) * np.array(values).reshape(size)
+
+    def choice(self, n, size=None):
+        # a uniform integer in [0, n). with size, an array of them, n may then be an array of bounds
+        if size is None:
+            return min(int(self.random() * n), n - 1)
+
+        return np.minimum((self.uniform(size=size) * n).astype(np.int64), np.asarray(n) - 1)
+
+    def beta(self, a, b, size=None):
+        # beta(1, b) is drawn by inverting its cdf, 1 - (1 - x) ** b, other shapes come from the generator
+        if a == 1:
+            return 1.0 - (1.0 - (self.random() if size is None else self.uniform(size=size))) ** (1.0 / b)
+
+        return self.generator.beta(a, b, size)
+
+    def seed_global(self):
+        # seed the global NumPy RNG, which environments draw from, from this generator
+        np.random.seed(self.generator.integers(2 ** 32, size=4))
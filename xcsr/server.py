@@ -0,0 +1,295 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+# local inference server for a trained population. clients send one JSON object per line over a Unix
+# domain socket or localhost TCP, and concurrent requests are coalesced into micro-batches which are
+# evaluated by a Policy in one matrix pass.
+#
+#   {"id": 7, "state": [0.1, 0.9, ...]}  ->  {"id": 7, "action": [1], "predictions": [412.5, 987.0]}
+#   {"id": 8, "command": "stats"}         ->  {"id": 8, "stats": {"latency": {...}, "batch_size": {...}}}
+#
+# a state no classifier matches gets a null action. predictions of actions no classifier advocates are null
+#
+#   python -m xcsr.server classifiers/replication0.xpop --unix /tmp/xcsr.sock
+#   python -m xcsr.server classifiers/replication0.xpop --port 8765 --max-batch-size 512 --max-latency-ms 1
+
+from xcsr.policy import Policy
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import numpy as np
+
+
+class Histogram:
+    # counts of values falling between consecutive bounds. the last bucket holds every value above the
+    # last bound
+
+    def __init__(self, bounds):
+        self.bounds = np.asarray(bounds, dtype=np.float64)
+        self.counts = np.zeros(len(self.bounds) + 1, dtype=np.int64)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def add(self, values):
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        self.counts += np.bincount(np.searchsorted(self.bounds, values), minlength=len(self.counts))
+        self.total += values.sum()
+        self.maximum = max(self.maximum, values.max(initial=0.0))
+
+    def quantile(self, q):
+        # upper bound of the bucket holding the q-th quantile
+        if len(self) == 0:
+            return 0.0
+
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q * len(self), side='left'))
+        return float(self.bounds[bucket]) if bucket < len(self.bounds) else self.maximum
+
+    def to_dict(self):
+        count = len(self)
+        return {'bounds': self.bounds.tolist(), 'counts': self.counts.tolist(), 'count': count,
+                'mean': self.total / count if count > 0 else 0.0, 'max': self.maximum,
+                'p50': self.quantile(0.5), 'p99': self.quantile(0.99)}
+
+
+class PolicyServer:
+    # coalesces the states of concurrent requests into batches of at most max_batch_size. a batch is
+    # evaluated once it is full, or max_latency seconds after its first request arrived
+
+    MAX_BATCH_SIZE = 256
+    MAX_LATENCY = 0.002
+
+    # histogram bounds, request latency in seconds and batch size in states
+    LATENCY_BOUNDS = [10 ** (e / 4) for e in range(-24, 1)]
+    BATCH_SIZE_BOUNDS = [2 ** e for e in range(16)]
+
+    def __init__(self, policy, max_batch_size=MAX_BATCH_SIZE, max_latency=MAX_LATENCY):
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self.latency = Histogram(self.LATENCY_BOUNDS)
+        self.batch_size = Histogram(self.BATCH_SIZE_BOUNDS)
+
+        # states, futures and arrival times of the requests waiting for the next batch
+        self._states, self._futures, self._arrivals = [], [], []
+        self._timer = None
+        self._server = None
+
+    async def start_unix(self, path):
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=path)
+        return self._server
+
+    async def start_tcp(self, host='127.0.0.1', port=0):
+        self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+        return self._server
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+    def stats(self):
+        return {'latency': self.latency.to_dict(), 'batch_size': self.batch_size.to_dict(),
+                'classifiers': len(self.policy), 'state_shape': list(self.policy.state_shape)}
+
+    async def predict(self, state):
+        # the action id and prediction array of state, evaluated with the next batch
+        future = asyncio.get_running_loop().create_future()
+        self._states.append(state)
+        self._futures.append(future)
+        self._arrivals.append(time.perf_counter())
+
+        if len(self._states) >= self.max_batch_size:
+            self._evaluate_batch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_latency, self._evaluate_batch)
+
+        return await future
+
+    def _evaluate_batch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        states, futures, arrivals = self._states, self._futures, self._arrivals
+        self._states, self._futures, self._arrivals = [], [], []
+
+        if len(states) == 0:
+            return
+
+        try:
+            predictions = self.policy.prediction_array(np.array(states, dtype=np.float64))
+            action_ids = self.policy.action_ids(predictions)
+        except Exception as e:
+            # a malformed batch fails all of its requests, the server keeps running
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, action_id, prediction in zip(futures, action_ids, predictions):
+            if not future.done():
+                future.set_result((int(action_id), prediction))
+
+        self.batch_size.add(len(states))
+        self.latency.add(time.perf_counter() - np.array(arrivals))
+
+    async def _handle_connection(self, reader, writer):
+        # requests on one connection are answered as their batches complete, not necessarily in order
+        pending = set()
+
+        try:
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                task = asyncio.ensure_future(self._respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, line, writer):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            request, response = {}, {'error': 'invalid request: {}'.format(e)}
+        else:
+            response = await self._response(request)
+
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    async def _response(self, request):
+        if not isinstance(request, dict):
+            return {'error': 'a request must be a JSON object'}
+
+        if request.get('command') == 'stats':
+            return {'stats': self.stats()}
+
+        if 'state' not in request:
+            return {'error': 'a request needs a state or a command'}
+
+        # a malformed state would fail every request in its batch
+        try:
+            state = np.asarray(request['state'], dtype=np.float64)
+        except (TypeError, ValueError):
+            state = None
+
+        if state is None or state.shape != self.policy.state_shape:
+            return {'error': 'state must be a list of {} numbers'.format(self.policy.state_shape[0])}
+
+        try:
+            action_id, prediction = await self.predict(state)
+        except Exception as e:
+            logging.error('could not evaluate a batch', exc_info=e)
+            return {'error': 'could not evaluate state: {}'.format(e)}
+
+        action = self.policy.possible_actions[action_id] if action_id >= 0 else None
+        return {'action': action, 'predictions': [None if np.isnan(p) else float(p) for p in prediction]}
+
+
+class Client:
+    # a client for PolicyServer. requests may be sent concurrently, responses are matched to them by id
+
+    def __init__(self, reader, writer):
+        self._reader, self._writer = reader, writer
+        self._next_id = 0
+        self._pending = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect_unix(cls, path):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    @classmethod
+    async def connect_tcp(cls, host='127.0.0.1', port=8765):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def predict(self, state):
+        # the server's response to state, see the module header
+        return await self._request({'state': [float(x) for x in state]})
+
+    async def stats(self):
+        return (await self._request({'command': 'stats'}))['stats']
+
+    async def close(self):
+        self._writer.close()
+        self._receiver.cancel()
+
+    async def _request(self, request):
+        request['id'] = self._next_id
+        self._next_id += 1
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request['id']] = future
+        self._writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        await self._writer.drain()
+
+        return await future
+
+    async def _receive(self):
+        while True:
+            line = await self._reader.readline()
+
+            if not line:
+                break
+
+            response = json.loads(line)
+            future = self._pending.pop(response.get('id'), None)
+
+            if future is not None and not future.done():
+                future.set_result(response)
+
+        # the server closed the connection
+        for future in self._pending.values():
+            future.set_exception(ConnectionError('connection closed by the server'))
+
+
+async def _serve(args):
+    policy = Policy.load(args.population)
+    server = PolicyServer(policy, args.max_batch_size, args.max_latency_ms / 1000)
+
+    if args.unix is not None:
+        await server.start_unix(args.unix)
+        print('serving {} classifiers on {}'.format(len(policy), args.unix))
+    else:
+        await server.start_tcp(args.host, args.port)
+        print('serving {} classifiers on {}:{}'.format(len(policy), args.host, args.port))
+
+    await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='serve a saved population')
+    parser.add_argument('population', help='population file written by Population.save')
+    parser.add_argument('--unix', help='path of a Unix domain socket to listen on, instead of TCP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=PolicyServer.MAX_BATCH_SIZE)
+    parser.add_argument('--max-latency-ms', type=float, default=PolicyServer.MAX_LATENCY * 1000)
+
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,78 @@
+# Brodderick Rodriguez
+# Auburn University - CSSE
+# 18 Oct. 2026
+
+import numpy as np
+
+
+class SumTree:
+    # a Fenwick (binary indexed) tree over non-negative values. supports O(log n) updates
+    # of a single value and O(log n) sampling of an index proportionally to its value
+
+    def __init__(self, capacity):
+        self._size = capacity
+
+        # values[i] holds the value at index i. tree is 1-based, tree[0] is unused
+        self._values = [0.0] * capacity
+        self._tree = [0.0] * (capacity + 1)
+
+    def __len__(self):
+        return self._size
+
+    def total(self):
+        return self.prefix_sum(self._size)
+
+    def prefix_sum(self, i):
+        # sum of the values at indices [0, i)
+        tree, s = self._tree, 0.0
+
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+
+        return s
+
+    def update(self, i, value):
+        # set the value at index i
+        tree, delta = self._tree, value - self._values[i]
+        self._values[i] = value
+        i += 1
+
+        while i <= self._size:
+            tree[i] += delta
+            i += i & -i
+
+    def rebuild(self, values):
+        # replace all values at once, O(n). values longer than the tree are truncated
+        values = np.asarray(values, dtype=np.float64)
+        padded = np.zeros(self._size)
+        padded[:min(len(values), self._size)] = values[:self._size]
+
+        # tree[i] is the sum of the values in (i - lowbit(i), i]
+        cumulative = np.concatenate(([0.0], np.cumsum(padded)))
+        index = np.arange(1, self._size + 1)
+        tree = cumulative[index] - cumulative[index - (index & -index)]
+
+        self._values = padded.tolist()
+        self._tree = [0.0] + tree.tolist()
+
+    def resize(self, capacity):
+        values = self._values[:capacity]
+        self._size = capacity
+        self.rebuild(values)
+
+    def find(self, x):
+        # the index i such that prefix_sum(i) <= x < prefix_sum(i + 1), for 0 <= x < total()
+        tree, position = self._tree, 0
+        step = 1 << (self._size.bit_length() - 1)
+
+        while step > 0:
+            following = position + step
+
+            if following <= self._size and tree[following] <= x:
+                position = following
+                x -= tree[following]
+
+            step >>= 1
+
+        return min(position, self._size - 1)
@@ -3,43 +3,68 @@
 # july 12 2019
 
 import os
+import re
+import concurrent.futures
 import numpy as np
 import matplotlib.pyplot as plt
 import json
 
 
-def load_metric(experiment_path, metric):
+def _replication_files(results_path):
+    # replication files in the order of their replication number
+    files = [file for file in os.listdir(results_path) if file.startswith('replication')]
+    return sorted(files, key=lambda file: int(re.sub(r'\D', '', file.split('.')[0]) or 0))
+
+
+def _open_replication(filename):
+    # .npy replications are memory-mapped, csv replications (written by older versions) are parsed
+    if filename.endswith('.npy'):
+        return np.load(filename, mmap_mode='r')
+
+    return np.loadtxt(filename, delimiter=',', ndmin=1)
+
+
+def load_metric(experiment_path, metric, max_workers=None, masked=False):
+    # load every replication of a metric into one (replications, ...) array. replications shorter than
+    # the longest one are padded with NaN, or masked if masked is True. files are opened, and copied
+    # into the array, on a pool of threads
     results_path = experiment_path + '/results/' + metric
-    contents = os.listdir(results_path)
+    contents = _replication_files(results_path)
 
     if len(contents) < 1:
         return
 
-    first_repetition = np.loadtxt(results_path + '/' + contents[0], delimiter=',')
-    dim = [d for d in first_repetition.shape]
-    dim.insert(0, len(contents))
-    data = np.zeros(dim)
-    data[0] = first_repetition
-    data[data == 0] = np.nan
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        replications = list(executor.map(_open_replication, [results_path + '/' + file for file in contents]))
+
+        # allocate for the longest replication along every axis
+        shape = np.max([r.shape for r in replications], axis=0)
+        data = np.full([len(replications)] + list(shape), np.nan)
+        padding = np.ones(data.shape, dtype=bool)
+
+        def copy(i):
+            index = (i,) + tuple(slice(0, n) for n in replications[i].shape)
+            data[index] = replications[i]
+            padding[index] = False
+
+        list(executor.map(copy, range(len(replications))))
 
-    for i, file in enumerate(contents[1:]):
-        r = np.loadtxt(results_path + '/' + file, delimiter=',')
-        # r = np.pad(r, r.shape[0] - data.shape[1], 'constant', constant_values=(np.nan))
-        data[i + 1] = r
+    if masked:
+        return np.ma.masked_array(data, mask=padding)
 
     return data
 
 
-def load_results(experiment_path):
-    rhos = load_metric(experiment_path, 'rhos')
-    predicted_rhos = load_metric(experiment_path, 'predicted_rhos')
-    classifier_counts = load_metric(experiment_path, 'microclassifier_counts')
-    steps = load_metric(experiment_path, 'steps')
+def load_results(experiment_path, max_workers=None):
+    rhos = load_metric(experiment_path, 'rhos', max_workers)
+    predicted_rhos = load_metric(experiment_path, 'predicted_rhos', max_workers)
+    classifier_counts = load_metric(experiment_path, 'microclassifier_counts', max_workers)
+    steps = load_metric(experiment_path, 'steps', max_workers)
     return rhos, predicted_rhos, classifier_counts, steps
 
 
-def _get_data_single_step(experiment_path):
-    rhos, pred_rhos, cc, _ = load_results(experiment_path)
+def _get_data_single_step(experiment_path, max_workers=None):
+    rhos, pred_rhos, cc, _ = load_results(experiment_path, max_workers)
     error = np.abs(rhos - pred_rhos)
 
     rhos_means = np.nanmean(rhos, axis=0)
@@ -51,8 +76,8 @@ def _get_data_single_step(experiment_path):
     return data, labels
 
 
-def _get_data_multi_step(experiment_path):
-    rhos, pred_rhos, cc, steps = load_results(experiment_path)
+def _get_data_multi_step(experiment_path, max_workers=None):
+    rhos, pred_rhos, cc, steps = load_results(experiment_path, max_workers)
     error = np.abs(rhos - pred_rhos)
 
     error_means = np.nanmean(np.nanmean(error, axis=0), axis=1) / 400
@@ -3,25 +3,30 @@
 # july 12 2019
 
 from xcsr.classifier import Classifier
+from xcsr.population import Population, is_more_general
+from xcsr.policy import Policy
+from xcsr.metrics import MetricsHistory
+from xcsr.rng import BlockRNG
+from xcsr.profiler import PhaseProfiler
 
-import time
+import copy
 import logging
 import numpy as np
 
 
 class XCSR:
-    def __init__(self, env, config):
-        # all the classifiers that currently exist
-        self._population = []
+    def __init__(self, env, config, metrics=None, checkpointer=None, seed=None):
+        # all the classifiers that currently exist, stored column-wise
+        self._population = Population(config, env.state_shape, env.possible_actions)
 
-        # formed from population. all classifiers that their predicate matches the current state
-        self._match_set = []
+        # formed from population. rows of all classifiers that their predicate matches the current state
+        self._match_set = np.array([], dtype=np.int64)
 
-        # formed from match_set. all classifiers that propose the action which was committed
-        self._action_set = []
+        # formed from match_set. ids of all classifiers that propose the action which was committed
+        self._action_set = np.array([], dtype=np.int64)
 
         # the action_set which was active at the previous time_step
-        self._previous_action_set = []
+        self._previous_action_set = np.array([], dtype=np.int64)
 
         # the environment object
         self._env = env
@@ -31,84 +36,180 @@ class XCSR:
         # the current configuration for hyper params
         self._config = config
 
-        # dictionary containing all rewards, expected rewards, and the number of microclassifiers
-        self.metrics_history = {}
-        self.reset_metrics()
+        # in lockstep mode, the number of samples processed so far. it replaces the environment's time_step
+        self._lockstep_time_step = None
+
+        # sink for all rewards, expected rewards, and the number of microclassifiers. by default
+        # they are kept in memory, in metrics_history
+        self._metrics = metrics if metrics is not None else MetricsHistory()
+
+        # takes periodic snapshots of this object, see Checkpointer. in single-step problems it is stepped
+        # after every problem, in multi-step problems the caller steps it between episodes
+        self._checkpointer = checkpointer
+
+        # every random decision of the learning loop is drawn from this object's own generator. seed is
+        # anything np.random.default_rng accepts, None draws fresh entropy. the global NumPy RNG, which
+        # environments draw from, is seeded from it so that a seeded run is reproducible end to end
+        self._rng = BlockRNG(seed)
+        self._rng.seed_global()
+
+        # time spent in each phase of the learning loop, only measured when profile_phases is set
+        self._profiler = PhaseProfiler(enabled=config.profile_phases)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, metrics=None, checkpointer=None):
+        # an XCSR in the state captured by snapshot. its environment and configuration are the copies taken
+        # with the snapshot, and metrics is restored to the snapshot's metrics state
+        xcs_object = cls(snapshot['env'], snapshot['config'], metrics, checkpointer)
+        xcs_object._population = snapshot['population']
+        xcs_object._metrics.restore(snapshot['metrics'])
+        xcs_object._lockstep_time_step = snapshot['lockstep_time_step']
+
+        # snapshots written before the previous action set was saved carry none
+        xcs_object._previous_action_set = snapshot.get('previous_action_set', xcs_object._previous_action_set)
+
+        Classifier.CLASSIFIER_ID = snapshot['classifier_id']
+        xcs_object._rng = snapshot['rng']
+        np.random.set_state(snapshot['global_rng'])
+
+        # the phase times measured before the snapshot, if the snapshot has them
+        if snapshot.get('profiler') is not None:
+            xcs_object._profiler = snapshot['profiler']
+
+        return xcs_object
+
+    def snapshot(self):
+        # a copy of everything needed to resume training: the population, the configuration (which holds the
+        # current p_explr), the environment, the metrics, the RNG states, the next classifier id and the previous
+        # action set. snapshots are taken between problems (or episodes), but a multi-step episode cut off at
+        # steps_per_episode leaves its last action set to be updated by the first step of the next episode.
+        # the population is copied whole, with its indexes and float aggregates, so that a resumed run
+        # continues exactly as the original would have
+        config = copy.copy(self._config)
+        copies = {id(self._config): config}
+
+        return {'population': copy.deepcopy(self._population, copies),
+                'config': config,
+                'env': copy.deepcopy(self._env, copies),
+                'metrics': self._metrics.snapshot(),
+                'lockstep_time_step': self._lockstep_time_step,
+                'previous_action_set': self._previous_action_set.copy(),
+                'classifier_id': Classifier.CLASSIFIER_ID,
+                'rng': copy.deepcopy(self._rng),
+                'global_rng': np.random.get_state(),
+                'profiler': copy.deepcopy(self._profiler)}
+
+    @property
+    def environment(self):
+        return self._env
+
+    @property
+    def config(self):
+        return self._config
+
+    @property
+    def metrics_history(self):
+        # dictionary containing all rewards, expected rewards, and the number of microclassifiers. metrics
+        # written to disk (see MetricsWriter) are flushed and read back from their files
+        return self._metrics.read()
 
     def reset_metrics(self):
-        self.metrics_history = {'rhos': [], 'predicted_rhos': [], 'microclassifier_counts': [], 'steps': 0}
+        self._metrics.reset()
 
     def _update_metrics(self, rho, predicted_rho):
-        # save the predicted payoff from committing this action
-        self.metrics_history['predicted_rhos'].append(predicted_rho)
+        # save the actual payoff received and the predicted payoff from committing this action,
+        # and the number of microclassifiers at this time step
+        self._metrics.record(rho, predicted_rho, self._population.total_numerosity)
 
-        # save the actual payoff received for committing this action
-        self.metrics_history['rhos'].append(rho)
+    def get_population(self):
+        # detached Classifier snapshots of the population
+        return self._population.to_classifiers()
 
-        # save the number of microclassifiers at this time step
-        num_micro_classifiers = sum([cl.numerosity for cl in self._population])
-        self.metrics_history['microclassifier_counts'].append(num_micro_classifiers)
+    def get_policy(self):
+        # a frozen Policy over the current population, for batched decisions without learning
+        return Policy(self._population)
 
-        # increment the number of steps
-        self.metrics_history['steps'] += 1
+    def get_profile(self):
+        # total and mean time and number of calls of every phase, None unless profile_phases is set
+        return self._profiler.summary()
 
-    def get_population(self):
-        return self._population
+    def save_population(self, filename):
+        # write the population to a population file, which Population.load reads back
+        self._population.save(filename)
 
     def run_experiment(self):
-        np.random.seed(int(time.time()))
+        # the whole loop is timed, so that the profile shows how much of it falls outside every phase
+        with self._profiler.phase('loop'):
+            self._run_experiment()
+
+    def _run_experiment(self):
         previous_rho, previous_sigma = 0, []
+        phase = self._profiler.phase
 
         while not self._env.termination_criteria_met():
             # get current situation from environment
             sigma = self._env.get_state()
-            logging.debug('sigma = {}'.format(sigma))
+            logging.debug('sigma = %s', sigma)
 
             # generate match set. uses population and sigma
-            self._match_set = self._generate_match_set(sigma)
-            logging.debug('match_set = {}'.format(self._match_set))
+            with phase('match'):
+                self._match_set = self._generate_match_set(sigma)
+            logging.debug('match_set = %s', self._match_set)
 
-            # generate prediction dictionary
-            predictions = self._generate_prediction_dictionary()
-            logging.debug('predictions = {}'.format(predictions))
+            # generate prediction array, indexed by action id
+            with phase('prediction'):
+                predictions, valid = self._generate_prediction_array()
+            logging.debug('predictions = %s', predictions)
 
-            # select action using predictions
-            action = self._select_action(predictions)
-            logging.debug('selected action = {}'.format(action))
+            with phase('action_selection'):
+                # select action using predictions
+                action_id = self._select_action(predictions, valid)
+                action = self._population.possible_actions[action_id]
 
-            # generate action set using action and match_set
-            self._action_set = self._generate_action_set(action)
-            logging.debug('action_set = {}'.format(self._action_set))
+                # generate action set using action and match_set
+                self._action_set = self._generate_action_set(action_id)
+            logging.debug('selected action = %s', action)
+            logging.debug('action_set = %s', self._action_set)
 
             # commit action and get payoff for action
-            rho = self._env.step(action)
+            with phase('environment_step'):
+                rho = self._env.step(action)
 
-            logging.debug('payoff (rho) = {}'.format(rho))
+            logging.debug('payoff (rho) = %s', rho)
 
-            self._update_metrics(rho=rho, predicted_rho=predictions[action])
+            with phase('metrics'):
+                self._update_metrics(rho=rho, predicted_rho=predictions[action_id])
 
             # if previous_action_set is not empty
             if len(self._previous_action_set) > 0:
                 # compute discounted payoff
-                non_null_actions = [v for v in predictions.values() if v is not None]
-                payoff = previous_rho + self._config.gamma * max(non_null_actions)
+                payoff = previous_rho + self._config.gamma * predictions[valid].max()
 
                 # update previous_action_set
-                self._update_set(_action_set=self._previous_action_set, payoff=payoff)
+                with phase('update'):
+                    self._update_set(_action_set=self._previous_action_set, payoff=payoff)
 
                 # run ga on previous_action_set and previous_sigma inserting and possibly deleting in population
-                self._run_ga(self._previous_action_set, previous_sigma)
+                with phase('ga'):
+                    self._run_ga(self._previous_action_set, previous_sigma)
 
             # if experiment is over based on information from environment
             if self._env.end_of_program:
                 # update action_set
-                self._update_set(_action_set=self._action_set, payoff=rho)
+                with phase('update'):
+                    self._update_set(_action_set=self._action_set, payoff=rho)
 
                 # run ga on previous_action_set and previous_sigma inserting and possibly deleting in population
-                self._run_ga(self._action_set, sigma)
+                with phase('ga'):
+                    self._run_ga(self._action_set, sigma)
 
                 # empty previous_action_set
-                self._previous_action_set = []
+                self._previous_action_set = np.array([], dtype=np.int64)
+
+                # single-step problems are checkpointed between problems
+                if self._checkpointer is not None and not self._config.is_multi_step:
+                    with phase('checkpoint'):
+                        self._checkpointer.step(self)
             else:
                 # update previous_action_set
                 self._previous_action_set = self._action_set
@@ -119,43 +220,123 @@ class XCSR:
                 # update previous sigma
                 previous_sigma = sigma
 
-    def _generate_match_set(self, sigma):
-        # local variable to hold all matching classifiers
-        _match_set = []
+    def run_lockstep(self, k):
+        # advance k single-step problem instances of the environment in lockstep against the population,
+        # through the environment's batched interface. at every step the (k, d) batch of states is matched
+        # at once, actions are selected row by row, the environment is stepped for the whole batch, and
+        # then every row's action set is updated and run through the GA in row order. training stops after
+        # steps_per_episode problems in total, as in run_experiment, whatever k is. the last batch is cut short
+        # to that count. the environment's own time_step and termination criteria are not used
+        if self._config.is_multi_step:
+            raise ValueError('lockstep training is only supported for single-step environments')
+
+        # the whole loop is timed, so that the profile shows how much of it falls outside every phase
+        with self._profiler.phase('loop'):
+            self._run_lockstep(k)
+
+    def _run_lockstep(self, k):
+        # a resumed snapshot continues from its own time step
+        if self._lockstep_time_step is None:
+            self._lockstep_time_step = 0
+
+        phase = self._profiler.phase
+
+        while self._lockstep_time_step < self._config.steps_per_episode:
+            # match the batch of states against the population at once
+            batch_size = min(k, self._config.steps_per_episode - self._lockstep_time_step)
+            sigmas = np.asarray(self._env.get_states(batch_size), dtype=np.float64)
+
+            with phase('match'):
+                match_masks = self._population.match_batch(sigmas)
+
+            # rows changed by covering while handling earlier rows are re-matched
+            self._population.begin_change_log()
+            action_ids, predicted_rhos, action_sets = [], [], []
+
+            for sigma, match_mask in zip(sigmas, match_masks):
+                # generate match set, starting from the rows matched in the batch
+                with phase('match'):
+                    self._match_set = self._generate_match_set(sigma, self._population.rematch(sigma, match_mask))
+
+                # generate prediction array, select action and generate action set
+                with phase('prediction'):
+                    predictions, valid = self._generate_prediction_array()
+
+                with phase('action_selection'):
+                    action_id = self._select_action(predictions, valid)
+                    action_sets.append(self._generate_action_set(action_id))
+
+                action_ids.append(action_id)
+                predicted_rhos.append(predictions[action_id])
+
+            self._population.end_change_log()
+
+            # commit all actions and get their payoffs
+            with phase('environment_step'):
+                rhos = self._env.step_batch([self._population.possible_actions[i] for i in action_ids])
+
+            for sigma, rho, predicted_rho, action_set in zip(sigmas, rhos, predicted_rhos, action_sets):
+                with phase('metrics'):
+                    self._update_metrics(rho=rho, predicted_rho=predicted_rho)
+
+                # every single-step problem ends after one step. update action_set and run ga on it
+                with phase('update'):
+                    self._update_set(_action_set=action_set, payoff=rho)
+
+                with phase('ga'):
+                    self._run_ga(action_set, sigma)
+                self._lockstep_time_step += 1
+
+            if self._checkpointer is not None:
+                with phase('checkpoint'):
+                    self._checkpointer.step(self)
 
-        # continue until we have at least one classifier that matches sigma
-        while len(_match_set) == 0:
-            # add all classifiers which match sigma to _match_set
-            _match_set = [cl for cl in self._population if cl.matches_sigma(sigma)]
+        self._lockstep_time_step = None
+
+    def _time_step(self):
+        if self._lockstep_time_step is not None:
+            return self._lockstep_time_step
+
+        return self._env.time_step
+
+    def _generate_match_set(self, sigma, _match_set=None):
+        # continue until the classifiers that match sigma advocate at least theta_mna actions. rows which are
+        # already known (from a batch match) are checked the same way as rows matched here
+        while True:
+            # test sigma against the bounds of every classifier at once, unless the rows are already known
+            if _match_set is None:
+                _match_set = self._population.match(sigma)
 
             # collect all the unique actions found in the local match set
-            all_found_actions = set([cl.action for cl in _match_set])
+            all_found_actions = np.unique(self._population.action_id[_match_set])
 
-            # if the length of all unique actions is less than our threshold, theta_mna, begin covering procedure
-            if len(all_found_actions) < self._config.theta_mna:
+            # if there are enough actions and at least one matching classifier the match set is complete
+            if len(_match_set) > 0 and len(all_found_actions) >= self._config.theta_mna:
+                return _match_set
+
+            # otherwise begin the covering procedure
+            with self._profiler.phase('covering'):
                 # create a new classifier, cl_c using the local match set and the current situation (sigma)
                 cl_c = self._generate_covering_classifier(_match_set, sigma)
 
                 # add the new classifier cl_c to the population
-                self._population.append(cl_c)
+                self._population.add(cl_c)
 
                 # choose individual for deletion by beta-distributed epsilon-greedy selection
                 self._delete_from_population()
 
-                # empty local match set M
-                _match_set = []
-
-        return _match_set
+            # empty local match set M
+            _match_set = None
 
     def _generate_covering_classifier(self, _match_set, sigma):
         # initialize new classifier
         cl = Classifier(config=self._config, state_shape=self._env.state_shape)
 
         # set the covering classifier's predicate
-        cl.set_predicates(sigma)
+        cl.set_predicates(sigma, self._rng)
 
         # get all the unique actions found in the match_set
-        actions_found = set([cl.action for cl in _match_set])
+        actions_found = set([self._population.possible_actions[i] for i in self._population.action_id[_match_set]])
 
         # subtract the possible actions from the actions found
         difference_actions = list(set(self._env.possible_actions) - actions_found)
@@ -163,284 +344,334 @@ class XCSR:
         # if there are possible actions that are not in the actions_found
         if len(difference_actions) > 0:
             # find a random action in difference_actions
-            choice = np.random.choice(len(difference_actions))
+            choice = self._rng.choice(len(difference_actions))
             cl.action = difference_actions[choice]
         else:
             # find a random action in self.config.possible_actions
-            choice = np.random.choice(len(self._env.possible_actions))
+            choice = self._rng.choice(len(self._env.possible_actions))
             cl.action = self._env.possible_actions[choice]
 
-        # set the time step to the current time step
-        cl.time_step = self._env.time_step
+        # set the time step of the last GA to the current time step
+        cl.last_time_step = self._time_step()
 
         return cl
 
-    def _generate_prediction_dictionary(self):
-        # initialize the prediction dictionary
-        pa = {a: None for a in self._env.possible_actions}
+    def _generate_prediction_array(self):
+        # action ids, fitness and fitness weighted payoff of every classifier in the match set
+        action_ids = self._population.action_id[self._match_set]
+        fitness = self._population.fitness[self._match_set]
+        weighted_payoff = self._population.predicted_payoff[self._match_set] * fitness
+        num_actions = len(self._population.possible_actions)
 
-        # initialize the fitness sum dictionary
-        fsa = {a: 0.0 for a in self._env.possible_actions}
+        # the prediction array and the fitness sum array, summed per action id
+        pa = np.bincount(action_ids, weights=weighted_payoff, minlength=num_actions)
+        fsa = np.bincount(action_ids, weights=fitness, minlength=num_actions)
 
-        for cl in self._match_set:
-            # if the value in prediction dictionary for cl.action is None
-            if pa[cl.action] is None:
-                # set it by accounting for fitness and predicted_payoff
-                pa[cl.action] = cl.predicted_payoff * cl.fitness
-            else:
-                # otherwise add to the action's weighted average
-                pa[cl.action] += cl.predicted_payoff * cl.fitness
-
-            # add to the action's fitness sum
-            fsa[cl.action] += cl.fitness
+        # an action has a prediction only if some classifier in the match set advocates it
+        valid = np.bincount(action_ids, minlength=num_actions) > 0
 
-        # for each possible action
-        for action in pa.keys():
-            # if the fitness sum of the action is not zero
-            if fsa[action] != 0:
-                # divide by the sum of the fitness for action across all classifiers
-                pa[action] /= fsa[action]
+        # divide by the sum of the fitness for each action whose fitness sum is not zero
+        nonzero = fsa != 0
+        pa[nonzero] /= fsa[nonzero]
+        pa[~valid] = np.nan
 
-        return pa
+        return pa, valid
 
-    def _select_action(self, predictions):
+    def _select_action(self, predictions, valid):
         self._config.p_explr -= self._config.p_explr / self._config.steps_per_episode
 
+        # get the ids of all actions that have some predicted value
+        options = np.flatnonzero(valid)
+
         # select action according to an epsilon-greedy policy
-        if np.random.uniform() < self._config.p_explr:
+        if self._rng.random() < self._config.p_explr:
             logging.debug('selecting random action...')
 
-            # get all actions that have some predicted value
-            options = [key for key, val in predictions.items() if val is not None]
-
             # do pure exploration
-            choice = np.random.choice(len(options))
+            choice = self._rng.choice(len(options))
             return options[choice]
 
         else:
-            # get all actions that have some predicted value
-            options = {key: val for key, val in predictions.items() if val is not None}
-
-            # sort options by action predicted value in non-ascending order
-            sorted_options = sorted(options.items(), key=lambda kv: (kv[1], kv[0]), reverse=True)
+            # find the actions with the highest weighted payoff
+            best = options[predictions[options] == predictions[options].max()]
 
-            # return the action corresponding to the highest weighted payoff
-            return sorted_options[0][0]
+            # break ties in favour of the greatest action
+            return max(best, key=lambda i: self._population.possible_actions[i])
 
-    def _generate_action_set(self, action):
-        # find all the classifiers in the match set which propose this action and return them
-        return [cl for cl in self._match_set if cl.action == action]
+    def _generate_action_set(self, action_id):
+        # find all the classifiers in the match set which propose this action and return their ids.
+        # ids rather than rows are kept, since rows move when other classifiers are deleted
+        rows = self._match_set[self._population.action_id[self._match_set] == action_id]
+        return self._population.ids[rows]
 
     def _update_set(self, _action_set, payoff):
-        # for each classifier in _action_set
-        for cl in _action_set:
-            # update experience
-            cl.experience += 1
+        # rows of the classifiers in _action_set which have not been deleted since the set was formed
+        rows = self._population.rows_of(_action_set)
 
-            experience_under_threshold = cl.experience < (1 / self._config.beta)
+        if len(rows) == 0:
+            return
 
-            # update predicted_payoff
-            if experience_under_threshold:
-                cl.predicted_payoff += (payoff - cl.predicted_payoff) / cl.experience
-            else:
-                cl.predicted_payoff += self._config.beta * (payoff - cl.predicted_payoff)
+        beta = self._config.beta
 
-            # update error (epsilon)
-            if experience_under_threshold:
-                cl.epsilon += (np.abs(payoff - cl.predicted_payoff) - cl.epsilon) / cl.experience
-            else:
-                cl.epsilon += self._config.beta * (np.abs(payoff - cl.predicted_payoff) - cl.epsilon)
+        # update experience
+        experience = self._population.experience[rows] + 1
+        self._population.experience[rows] = experience
 
-            summed_difference = sum([c.numerosity - cl.action_set_size for c in _action_set])
+        experience_under_threshold = experience < (1 / beta)
 
-            # update action_set_size
-            if experience_under_threshold:
-                cl.action_set_size += summed_difference / cl.experience
-            else:
-                cl.action_set_size += self._config.beta * summed_difference
+        # update predicted_payoff
+        predicted_payoff = self._population.predicted_payoff[rows]
+        difference = payoff - predicted_payoff
+        predicted_payoff += np.where(experience_under_threshold, difference / experience, beta * difference)
+        self._population.predicted_payoff[rows] = predicted_payoff
+
+        # update error (epsilon)
+        epsilon = self._population.epsilon[rows]
+        difference = np.abs(payoff - predicted_payoff) - epsilon
+        epsilon += np.where(experience_under_threshold, difference / experience, beta * difference)
+        self._population.epsilon[rows] = epsilon
+
+        # update action_set_size towards the number of micro-classifiers in the set. this is the standard XCS
+        # update. the form it replaced added, for each classifier, the sum over the set of (numerosity -
+        # action_set_size), i.e. |A| times its own error, which diverges to inf and nan for large sets. the
+        # deletion votes are built from action_set_size, so it has to stay an estimate of the set size
+        action_set_size = self._population.action_set_size[rows]
+        difference = self._population.numerosity[rows].sum() - action_set_size
+        action_set_size += np.where(experience_under_threshold, difference / experience, beta * difference)
+        self._population.action_set_size[rows] = action_set_size
 
         # update fitness for each classifier in _action_set
-        self._update_fitness(_action_set)
+        self._update_fitness(rows)
 
-    def _update_fitness(self, _action_set):
-        # set a local variable to track the accuracy over the entire set_
-        accuracy_sum = 0.0
+        # let the most general accurate classifier in _action_set absorb the classifiers it subsumes
+        if self._config.do_action_set_subsumption:
+            self._do_action_set_subsumption(rows)
 
-        # initialize accuracy vector (in dictionary form)
-        k = {_action_set[i]: 0.0 for i in range(len(_action_set))}
+    def _do_action_set_subsumption(self, rows):
+        population = self._population
 
-        # for each classifier in set_
-        for cl in _action_set:
-            # if classifier error is less than the error threshold
-            if cl.epsilon < self._config.epsilon_0:
-                # set the accuracy to 100%
-                k[cl] = 1
-            else:
-                k[cl] = ((cl.epsilon / self._config.epsilon_0) ** -self._config.v) * self._config.alpha
+        # classifiers experienced and accurate enough to subsume others
+        could_subsume = population.could_subsume(rows)
+
+        if not could_subsume.any():
+            return
+
+        # the most general of them, by the total width of its intervals within the predicate range
+        subsumer = rows[np.argmax(np.where(could_subsume, population.generality(rows), -np.inf))]
 
-            # update accuracy_sum using a weighted sum based on classifier numerosity
-            accuracy_sum += k[cl] * cl.numerosity
+        # every other classifier in the set which it is more general than
+        subsumed = is_more_general(population.lower[subsumer], population.upper[subsumer], population.lower[rows],
+                                   population.upper[rows])
+        subsumed = rows[subsumed & (rows != subsumer)]
 
-        # for each classifier in set_
-        for cl in _action_set:
-            cl.fitness += self._config.beta * (((k[cl] * cl.numerosity) / accuracy_sum) - cl.fitness)
+        if len(subsumed) == 0:
+            return
+
+        # absorb their numerosity, then remove them from the highest row down, so that swap-removal
+        # never moves a row which is still to be removed
+        population.add_numerosity(subsumer, population.numerosity[subsumed].sum())
+
+        for row in np.sort(subsumed)[::-1]:
+            population.remove(row)
+
+    def _update_fitness(self, rows):
+        epsilon = self._population.epsilon[rows]
+        numerosity = self._population.numerosity[rows]
+
+        # accuracy vector, 100% accurate if classifier error is less than the error threshold
+        with np.errstate(divide='ignore'):
+            k = np.where(epsilon < self._config.epsilon_0, 1.0,
+                         ((epsilon / self._config.epsilon_0) ** -self._config.v) * self._config.alpha)
+
+        # weighted accuracy based on classifier numerosity and its sum over the entire set
+        weighted_accuracy = k * numerosity
+        accuracy_sum = weighted_accuracy.sum()
+
+        fitness = self._population.fitness[rows]
+        fitness += self._config.beta * ((weighted_accuracy / accuracy_sum) - fitness)
+        self._population.set_fitness(rows, fitness)
 
     def _run_ga(self, _action_set, sigma):
-        # get average time since last GA
-        weighted_time = sum([cl.last_time_step * cl.numerosity for cl in _action_set])
+        # rows of the classifiers in _action_set which have not been deleted since the set was formed
+        population = self._population
+        rows = population.rows_of(_action_set)
 
-        # get the total number of micro-classifiers currently present in set_
-        num_micro_classifiers = sum([cl.numerosity for cl in _action_set])
+        if len(rows) == 0:
+            return
 
-        # compute the average time since last GA
-        average_time = weighted_time / num_micro_classifiers
+        # compute the average time since last GA, weighted by numerosity
+        numerosity = population.numerosity[rows]
+        average_time = (population.last_time_step[rows] * numerosity).sum() / numerosity.sum()
 
         # if the average time since last GA is less than the threshold then do nothing
-        if self._env.time_step - average_time <= self._config.theta_ga:
+        if self._time_step() - average_time <= self._config.theta_ga:
             return
 
         # update the time since last GA for all classifiers
-        for cl in _action_set:
-            cl.last_time_step = self._env.time_step
-
-        # select two parents from the set_
-        parent1 = self._select_offspring(_action_set)
-        parent2 = self._select_offspring(_action_set)
-
-        # copy each parent and create two new classifiers, child1 and child2
-        child1, child2 = parent1.copy(), parent2.copy()
-
-        # set their numerosity to 1
-        child1.numerosity = child2.numerosity = 1
-
-        # set their experience to 0
-        child1.experience = child2.experience = 0
-
-        # if a random number is less than the threshold for applying crossover
-        if np.random.uniform() < self._config.chi:
-            # apply crossover to child1 and child2
-            self._apply_crossover(child1, child2)
-
-            # set child1 and child2 payoff to the mean of both parents
-            child1.predicted_payoff = child2.predicted_payoff = \
-                np.mean([parent1.predicted_payoff, parent2.predicted_payoff])
-
-            # set child1 and child2 error (epsilon) to the mean of both parents
-            child1.epsilon = child2.epsilon = np.mean([parent1.epsilon, parent2.epsilon])
-
-            # set child1 and child2 fitness to 10% of the mean of both parents
-            child1.fitness = child2.fitness = np.mean([parent1.fitness, parent2.fitness]) * 0.1
-
-        # for both children
-        for child in [child1, child2]:
-            # apply mutation to child according to sigma
-            self._apply_mutation(child, sigma)
-
-            # if subsumption is true
-            if self._config.do_ga_subsumption:
-                # check if parent1 subsumes child
-                if parent1.does_subsume(child):
-                    # if it does, increment parent1 numerosity
-                    parent1.numerosity += 1
-                # check if parent2 subsumes child
-                elif parent2.does_subsume(child):
-                    # if it does, increment parent2 numerosity
-                    parent2.numerosity += 1
-                else:
-                    # otherwise, add the child to the population of classifiers
-                    self._insert_in_population(child)
+        population.last_time_step[rows] = self._time_step()
+
+        # select ga_offspring_pairs pairs of parents, parents[2 * k] and parents[2 * k + 1] form pair k
+        parents = self._select_offspring(rows, 2 * self._config.ga_offspring_pairs)
+
+        # the children start as copies of their parents' bounds, action and estimates
+        lower, upper = population.lower[parents], population.upper[parents]
+        action_ids = population.action_id[parents]
+        predicted_payoff = population.predicted_payoff[parents]
+        epsilon = population.epsilon[parents]
+        fitness = population.fitness[parents]
+        last_time_step = population.last_time_step[parents]
+        action_set_size = population.action_set_size[parents]
+
+        # apply crossover to the pairs chosen by chi. their children get the mean payoff and error
+        # of both parents, and 10% of their mean fitness
+        crossed = np.repeat(self._apply_crossover(lower, upper), 2)
+
+        for values, scale in ((predicted_payoff, 1.0), (epsilon, 1.0), (fitness, 0.1)):
+            means = np.repeat(values.reshape(-1, 2).mean(axis=1), 2) * scale
+            values[crossed] = means[crossed]
+
+        # apply mutation to every child according to sigma
+        self._apply_mutation(lower, upper, action_ids, sigma)
+
+        # for every child, the parent (0 or 1 in its pair) which subsumes it, or -1
+        subsumers = np.full(len(parents), -1)
+
+        if self._config.do_ga_subsumption:
+            subsumers = self._find_parent_subsumers(parents, lower, upper, action_ids)
+
+        parent_ids = population.ids[parents].reshape(-1, 2)
+
+        for i in range(len(parents)):
+            # the row of the subsuming parent, unless it has been deleted since the GA started
+            parent_rows = population.rows_of([parent_ids[i // 2, subsumers[i]]]) if subsumers[i] >= 0 else []
+
+            if len(parent_rows) > 0:
+                # if it does, increment the parent's numerosity
+                population.add_numerosity(parent_rows[0], 1)
             else:
-                # if subsumption is false, add the child to the population of classifiers
-                self._insert_in_population(child)
+                # otherwise, add the child to the population of classifiers
+                self._insert_in_population(lower[i], upper[i], action_ids[i], predicted_payoff=predicted_payoff[i],
+                                           epsilon=epsilon[i], fitness=fitness[i], experience=0,
+                                           last_time_step=last_time_step[i], action_set_size=action_set_size[i],
+                                           numerosity=1)
 
             # choose individual for deletion by beta-distributed epsilon-greedy selection
             self._delete_from_population()
 
-    @staticmethod
-    def _select_offspring(_action_set):
-        # if some random number is less than a threshold then select using a beta distribution the best classifier
-        if np.random.uniform() < 0.5:
-            # select a bias index
-            choice_point = int(np.floor(np.random.beta(1, 5) * len(_action_set)))
+    def _select_offspring(self, rows, count):
+        # count rows drawn from rows. each is, with even odds, picked by a beta distributed index into rows
+        # sorted by descending predicted payoff (biased towards the best), or picked uniformly at random
+        by_payoff = rows[np.argsort(-self._population.predicted_payoff[rows], kind='stable')]
 
-            # sort the _action_set
-            sorted_action_set = sorted(_action_set, reverse=True)
+        biased = self._rng.uniform(size=count) < 0.5
+        choice_points = np.floor(self._rng.beta(1, 5, size=count) * len(rows)).astype(np.int64)
+        random_points = self._rng.choice(len(rows), size=count)
 
-            # return that classifier
-            return sorted_action_set[choice_point]
-        else:
-            # otherwise, return a random classifier
-            return np.random.choice(_action_set)
-
-    @staticmethod
-    def _apply_crossover(child1, child2):
-        # find two values in [0, len(predicate)) s.t. x <= y
-        x = np.random.choice(range(len(child1.predicate)))
-        y = np.random.choice(range(x, len(child1.predicate)))
-
-        # swap the i-th predicate in child1's and child2's predicate
-        for i in range(int(x), int(y)):
-            child1.predicate[i], child2.predicate[i] = child2.predicate[i], child1.predicate[i]
-
-    def _apply_mutation(self, child, sigma):
-        # for each index in the child's predicate
-        for i in range(self._env.state_shape[0]):
-            # if some random number is less than the probability of mutating an allele in the offspring
-            if np.random.uniform() < self._config.mu:
-                # if the attribute at index i is already the wildcard
-                if child.predicate[i] == Classifier.WILDCARD_ATTRIBUTE_VALUE:
-                    # swap it with the i-th attribute in sigma
-                    p_min = sigma[i] - self._config.predicate_1
-                    p_max = sigma[i] + self._config.predicate_1
-                    child.force_set_predicate_i(i, p_min, p_max)
-                else:
-                    # otherwise, swap it to the wildcard
-                    child.predicate[i] = Classifier.WILDCARD_ATTRIBUTE_VALUE
+        return np.where(biased, by_payoff[choice_points], rows[random_points])
+
+    def _apply_crossover(self, lower, upper):
+        # two-point crossover between the children 2 * k and 2 * k + 1 of every pair k chosen by chi.
+        # the attributes in [x, y) are swapped, for 0 <= x <= y < d. returns which pairs were crossed
+        num_pairs, d = len(lower) // 2, lower.shape[1]
+        crossed = self._rng.uniform(size=num_pairs) < self._config.chi
+
+        x = self._rng.choice(d, size=num_pairs)
+        y = x + self._rng.choice(d - x, size=num_pairs)
+
+        attributes = np.arange(d)
+        swapped = crossed[:, None] & (attributes >= x[:, None]) & (attributes < y[:, None])
+
+        for bounds in (lower, upper):
+            first, second = bounds[0::2], bounds[1::2]
+            bounds[0::2], bounds[1::2] = np.where(swapped, second, first), np.where(swapped, first, second)
+
+        return crossed
+
+    def _apply_mutation(self, lower, upper, action_ids, sigma):
+        # one random mask per child picks the alleles to mutate
+        mutated = self._rng.uniform(size=lower.shape) < self._config.mu
+        wildcards = (lower == Classifier.PREDICATE_MIN) & (upper == Classifier.PREDICATE_MAX)
+
+        # a mutated wildcard becomes the interval around sigma, any other mutated allele becomes the wildcard
+        sigma = np.asarray(sigma, dtype=np.float64)
+        p_min, p_max = sigma - self._config.predicate_1, sigma + self._config.predicate_1
+        to_interval, to_wildcard = mutated & wildcards, mutated & ~wildcards
+
+        lower[to_wildcard], upper[to_wildcard] = Classifier.PREDICATE_MIN, Classifier.PREDICATE_MAX
+        lower[to_interval] = np.broadcast_to(np.minimum(p_min, p_max), lower.shape)[to_interval]
+        upper[to_interval] = np.broadcast_to(p_max, upper.shape)[to_interval]
+
+        # the action of a mutated child becomes one of the other possible actions, at random
+        num_actions = len(self._population.possible_actions)
 
-        # if some random number is less than the probability of mutating an allele in the offspring
-        if np.random.uniform() < self._config.mu:
-            # then generate a list of all the other possible actions
-            other_possible_actions = list(set(self._env.possible_actions) - {child.action})
+        if num_actions > 1:
+            mutated = self._rng.uniform(size=len(action_ids)) < self._config.mu
+            other = self._rng.choice(num_actions - 1, size=len(action_ids))
+            action_ids[mutated] = (other + (other >= action_ids))[mutated]
 
-            # assign the action of this child to that random action
-            choice = np.random.choice(len(other_possible_actions))
-            child.action = other_possible_actions[choice]
+    def _find_parent_subsumers(self, parents, lower, upper, action_ids):
+        # for every child, 0 or 1 for the first parent of its pair which subsumes it, or -1. a parent subsumes
+        # a child with the same action if it is experienced and accurate enough, and every attribute of its
+        # predicate is the wildcard or contains the child's attribute
+        population = self._population
+        pairs = np.repeat(parents.reshape(-1, 2), 2, axis=0)
+
+        more_general = is_more_general(population.lower[pairs], population.upper[pairs], lower[:, None],
+                                       upper[:, None])
+
+        subsumes = population.could_subsume(pairs) & (population.action_id[pairs] == action_ids[:, None]) & more_general
+        return np.where(subsumes[:, 0], 0, np.where(subsumes[:, 1], 1, -1))
 
     def _delete_from_population(self):
         # if the number of classifiers is less than the max allowed the do nothing
-        if self._config.N > sum([cl.numerosity for cl in self._population]):
+        if self._config.N > self._population.total_numerosity:
             return
 
-        # if some random number is less than a threshold then select using a beta distribution the best classifier
-        if np.random.uniform() < 0.5:
-            # select a bias index
-            choice_point = int(np.floor(np.random.beta(1, 5) * len(self._population)))
+        with self._profiler.phase('deletion'):
+            if self._config.deletion_strategy == 'vote':
+                # select a classifier with probability proportional to its deletion vote
+                row = self._population.select_for_deletion(self._rng.random())
+
+                # if the classifier's numerosity is greater than 1 then decrement it, otherwise remove it
+                if self._population.numerosity[row] > 1:
+                    self._population.add_numerosity(row, -1)
+                else:
+                    self._population.remove(row)
+
+            # if some random number is less than a threshold then select using a beta distribution
+            # the best classifier
+            elif self._rng.random() < 0.5:
+                # select a bias index
+                choice_point = int(np.floor(self._rng.beta(1, 5) * len(self._population)))
 
-            # sort the _action_set
-            sorted_population = sorted(self._population, reverse=False)
+                # sort the population by predicted payoff (stable, like sorted())
+                sorted_population = np.argsort(self._population.predicted_payoff, kind='stable')
 
-            # grab the classifier corresponding to the choice point
-            cl = sorted_population[choice_point]
+                # grab the classifier corresponding to the choice point
+                row = sorted_population[choice_point]
 
-            # if the classifier's numerosity is greater than 1 then decrement it, otherwise remove it
-            if cl.numerosity > 1:
-                cl.numerosity -= 1
+                # if the classifier's numerosity is greater than 1 then decrement it, otherwise remove it
+                if self._population.numerosity[row] > 1:
+                    self._population.add_numerosity(row, -1)
+                else:
+                    self._population.remove(row)
             else:
-                self._population.remove(cl)
-        else:
-            # otherwise choose a random classifier to delete
-            cl = np.random.choice(self._population)
-            self._population.remove(cl)
-
-    def _insert_in_population(self, other):
-        # for each classifier currently in the population
-        for cl in self._population:
-            # if the other classifier is equal to the parameter classifier in both predicate and action
-
-            if cl.predicate_subsumes(other) and cl.action == other.action:
-                # then increment the other classifier's numerosity
-                cl.numerosity += 1
-                return
-
-        # if this classifier is unique then add it to the population
-        self._population.append(other)
+                # otherwise choose a random classifier to delete
+                row = self._rng.choice(len(self._population))
+                self._population.remove(row)
+
+    def _insert_in_population(self, lower, upper, action_id, **values):
+        with self._profiler.phase('insertion'):
+            if self._config.insertion_mode == 'subsumes':
+                # find a classifier with the same action whose predicate contains the new predicate
+                row = self._population.find_subsumer(action_id, lower, upper)
+            else:
+                # find a classifier equal to the new classifier in both predicate and action
+                row = self._population.find_duplicate(action_id, lower, upper)
+
+            if row is not None:
+                # then increment that classifier's numerosity
+                self._population.add_numerosity(row, 1)
+            else:
+                # if this classifier is unique then add it to the population
+                self._population.add_row(lower, upper, action_id, Classifier.next_id(), **values)
@@ -3,15 +3,53 @@
 # july 12 2019
 
 from xcsr.xcsr import XCSR
+from xcsr.population import Population
+from xcsr.metrics import MetricsWriter
+from xcsr.checkpoint import Checkpointer, load_checkpoint
 from xcsr.environment import Environment
 
 import numpy as np
-import multiprocessing
+import concurrent.futures
+import contextlib
+import importlib.util
 import logging
 import os
 import time
 import json
-import pickle
+
+
+# environment variables read by the common BLAS and OpenMP runtimes for their thread pool size
+BLAS_THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                         'BLIS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+
+@contextlib.contextmanager
+def _blas_thread_variables(num_threads):
+    # BLAS reads the thread variables only when it is loaded. they are set in this process while the pool
+    # runs, so that workers started with a fresh interpreter load BLAS with them. the previous values are
+    # restored afterwards
+    previous = {variable: os.environ.get(variable) for variable in BLAS_THREAD_VARIABLES}
+    os.environ.update((variable, str(num_threads)) for variable in BLAS_THREAD_VARIABLES)
+
+    try:
+        yield
+    finally:
+        for variable, value in previous.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+
+
+def _limit_blas_threads(num_threads):
+    # runs in every worker process, so that replications running side by side do not oversubscribe the cores.
+    # a forked worker inherits the BLAS already loaded in this process, only threadpoolctl can resize its pool
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+
+    threadpool_limits(limits=num_threads)
 
 
 class XCSRDriver:
@@ -22,18 +60,56 @@ class XCSRDriver:
         self.env_class = None
         self.env_args = None
         self.replications = 10
+
+        # number of environment instances a single-step replication advances in lockstep. a replication trains
+        # on steps_per_episode problems whatever this is, lockstep_environments of them at a time
+        self.lockstep_environments = 1
+
+        # maximum number of replications run at the same time (None uses every core)
+        # and number of BLAS threads allowed in each of them
+        self.max_workers = None
+        self.blas_threads = 1
         self.save_location = './'
         self.experiment_name = None
         self._root_data_directory = None
 
+        # entropy of the np.random.SeedSequence every replication's seed is spawned from. None draws fresh
+        # entropy, which is saved in metadata.json (and reused when resuming)
+        self.seed = None
+        self._seed_entropy = None
+        self._replication_seeds = None
+
+        # continue the experiment experiment_name in save_location instead of starting a new one. finished
+        # replications are loaded, and the others resume from their latest checkpoint (or start over)
+        self.resume = False
+
+        # time every phase of the learning loop and save the times of each replication to
+        # profile_replication{n}.json next to metadata.json. None leaves it to the configuration's profile_phases
+        self.profile_phases = None
+
     def run(self):
         logging.info('Running XCSDriver')
 
         self._check_arguments()
         logging.info('XCSDriver passed argument check')
 
-        self._setup_directories()
-        logging.info('XCSDriver created directory: {}'.format(self._root_data_directory))
+        if self.resume:
+            self._root_data_directory = self.save_location + '/' + self.experiment_name
+            os.makedirs(self._root_data_directory + '/checkpoints', exist_ok=True)
+            logging.info('XCSDriver resuming in directory: {}'.format(self._root_data_directory))
+
+            # replications which restart from scratch get the seeds they were first given
+            seed = self.seed
+
+            if seed is None:
+                with open(self._root_data_directory + '/metadata.json') as f:
+                    seed = json.load(f).get('seed')
+
+            self._spawn_replication_seeds(seed)
+        else:
+            self._spawn_replication_seeds(self.seed)
+            self._setup_directories()
+            logging.info('XCSDriver created directory: {}'.format(self._root_data_directory))
 
         logging.info('XCSDriver running all processes')
         return self._run_processes()
@@ -56,21 +132,42 @@ class XCSRDriver:
         if isinstance(self.env_class, Environment):
             raise ValueError('config.env cannot be an instance, must be an uninitialized class')
 
+        # check if the pool size is valid
+        if self.max_workers is not None and self.max_workers < 1:
+            raise ValueError('max_workers cannot be less than 1')
+
+        # check if lockstep training was requested for a multi-step environment
+        if self.lockstep_environments < 1:
+            raise ValueError('lockstep_environments cannot be less than 1')
+
+        if self.lockstep_environments > 1 and self.config_class().is_multi_step:
+            raise ValueError('lockstep training is only supported for single-step environments')
+
+        # check if the experiment to resume exists
+        if self.resume:
+            if self.experiment_name is None:
+                raise ValueError('experiment_name must be specified to resume an experiment')
+
+            if not os.path.isdir(self.save_location + '/' + self.experiment_name):
+                raise ValueError('cannot resume {}, it does not exist in {}'.format(self.experiment_name,
+                                                                                     self.save_location))
+
     def _setup_directories(self):
         time_now = str(int(time.time()))
         self.experiment_name = self.experiment_name or time_now
 
         self._root_data_directory = self.save_location + '/' + self.experiment_name
 
-        directories = ['', '/classifiers', '/results', '/results/rhos', '/results/predicted_rhos',
+        directories = ['', '/classifiers', '/checkpoints', '/results', '/results/rhos', '/results/predicted_rhos',
                        '/results/microclassifier_counts', '/results/steps']
 
         for directory in directories:
             os.mkdir(self._root_data_directory + directory)
 
         metadata_file = self._root_data_directory + '/metadata.json'
-        metadata = {key: val for key, val in self.config_class().__dict__.items()}
+        metadata = {key: val for key, val in self._new_config().__dict__.items()}
         metadata['replications'] = self.replications
+        metadata['seed'] = self._seed_entropy
         metadata['name'] = self.experiment_name
         metadata['root_dir'] = self._root_data_directory
         metadata['start_time'] = time_now
@@ -78,62 +175,124 @@ class XCSRDriver:
         f = open(metadata_file, 'w')
         json.dump(metadata, f)
 
+    def _spawn_replication_seeds(self, seed):
+        seed_sequence = np.random.SeedSequence(seed)
+        self._seed_entropy = seed_sequence.entropy
+        self._replication_seeds = seed_sequence.spawn(self.replications)
+
+    def _new_config(self):
+        config = self.config_class()
+
+        if self.profile_phases is not None:
+            config.profile_phases = self.profile_phases
+
+        return config
+
+    def _seed_replication(self, replication_num):
+        # seed the global NumPy RNG, which configurations draw their random parameters from, and return the
+        # seed of the replication's XCSR. both are independent streams of the replication's seed
+        global_seed, xcsr_seed = self._replication_seeds[replication_num].spawn(2)
+        np.random.seed(global_seed.generate_state(4))
+        return xcsr_seed
+
     def _run_processes(self):
         if self.config_class().is_multi_step:
-            processes = []
+            return self._run_replications(self._run_multi_step_replication)
+        else:
+            return self._run_replications(self._run_single_step_replication)
 
-            for process in range(self.replications):
-                process = multiprocessing.Process(target=self._run_multi_step_replication, args=(process,))
-                processes.append(process)
-                process.start()
+    def _run_replications(self, target):
+        # run the replications on a bounded process pool. populations are returned in replication order,
+        # with None in place of any replication which failed
+        populations = [None] * self.replications
+        max_workers = min(self.max_workers or os.cpu_count() or 1, self.replications)
 
-            print('queued all processes')
+        if importlib.util.find_spec('threadpoolctl') is None:
+            logging.warning('threadpoolctl is not installed, workers which inherit an already loaded BLAS '
+                            'are not limited to blas_threads threads')
 
-            for process in range(min(self.replications, len(processes))):
-                processes[process].join()
-                print('joined process', process)
-        else:
-            classifiers = []
-            for process in range(self.replications):
-                c = self._run_single_step_replication(process)
-                classifiers.append(c)
-            return classifiers
+        with _blas_thread_variables(self.blas_threads), \
+                concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_limit_blas_threads,
+                                                       initargs=(self.blas_threads,)) as executor:
+            futures = {executor.submit(target, replication_num): replication_num
+                       for replication_num in range(self.replications)}
+
+            # collect results as replications complete
+            for future in concurrent.futures.as_completed(futures):
+                replication_num = futures[future]
+                exception = future.exception()
+
+                if exception is not None:
+                    logging.error('replication {} failed'.format(replication_num), exc_info=exception)
+                    print('replication {} failed: {!r}'.format(replication_num, exception))
+                else:
+                    populations[replication_num] = future.result()
+
+        failed = [i for i, population in enumerate(populations) if population is None]
+
+        if len(failed) > 0:
+            logging.error('{} of {} replications failed: {}'.format(len(failed), self.replications, failed))
+
+        return populations
 
     def _run_single_step_replication(self, replication_num):
-        print('replication {} started'.format(replication_num))
+        if self._is_finished(replication_num):
+            return self._load_population(replication_num)
 
-        config = self.config_class()
-        env = self.env_class(config, self.env_args)
+        print('replication {} started'.format(replication_num))
 
-        xcs_object = XCSR(env=env, config=config)
-        xcs_object.run_experiment()
+        checkpointer = self._open_checkpointer(replication_num)
+        snapshot = self._load_checkpoint(replication_num)
 
-        self._save_replication(xcs_object, replication_num)
+        # metrics are streamed to disk while the replication runs
+        metrics = MetricsWriter(self._metric_filenames(replication_num), resume=snapshot is not None)
 
-        return xcs_object.get_population()
+        if snapshot is None:
+            seed = self._seed_replication(replication_num)
+            config = self._new_config()
+            env = self.env_class(config, self.env_args)
+            xcs_object = XCSR(env=env, config=config, metrics=metrics, checkpointer=checkpointer, seed=seed)
+        else:
+            xcs_object = XCSR.from_snapshot(snapshot, metrics=metrics, checkpointer=checkpointer)
 
-        # self._save_replication(xcs_object.metrics_history, replication_num)
+        if self.lockstep_environments > 1:
+            xcs_object.run_lockstep(self.lockstep_environments)
+        else:
+            xcs_object.run_experiment()
 
-    @staticmethod
-    def _post_process_episode(config, episode_metrics):
-        _dict = {}
+        metrics.close()
+        self._finish_replication(xcs_object, checkpointer, replication_num)
 
-        for key, value in episode_metrics.items():
-            new_val = np.array(value).astype(float)
-            length = len(value) if hasattr(value, '__len__') else 1
-            new_val = np.pad(new_val, [(0, config.steps_per_episode - length)], mode='constant', constant_values=np.nan)
-            _dict[key] = new_val
+        return xcs_object.get_population()
 
-        return _dict
+    def _metric_filenames(self, replication_num):
+        path = self._root_data_directory + '/results/'
+        keys = ('rhos', 'predicted_rhos', 'microclassifier_counts', 'steps')
+        return {key: path + key + '/replication' + str(replication_num) + '.npy' for key in keys}
 
     def _run_multi_step_replication(self, replication_num):
+        if self._is_finished(replication_num):
+            return self._load_population(replication_num)
+
         print('replication {} started'.format(replication_num))
 
-        config = self.config_class()
-        env = self.env_class(config=config)
-        metrics, i = [], 0
+        checkpointer = self._open_checkpointer(replication_num)
+        snapshot = self._load_checkpoint(replication_num)
 
-        xcs_object = XCSR(env=env, config=config)
+        if snapshot is None:
+            seed = self._seed_replication(replication_num)
+            config = self._new_config()
+            env = self.env_class(config=config)
+            xcs_object = XCSR(env=env, config=config, checkpointer=checkpointer, seed=seed)
+            i = 0
+        else:
+            xcs_object = XCSR.from_snapshot(snapshot, checkpointer=checkpointer)
+            config, env = xcs_object.config, xcs_object.environment
+            i = snapshot['progress']['episode']
+
+        # exploit episode metrics are written straight into preallocated (episodes x steps_per_episode)
+        # memory-mapped .npy files, NaN past the end of each episode. 'steps' holds one value per episode
+        metrics = self._open_episode_metrics(config, replication_num, first_episode=i)
 
         while i < config.episodes_per_replication:
             env.reset()
@@ -144,46 +303,103 @@ class XCSRDriver:
             xcs_object.run_experiment()
 
             if config.p_explr == 0:
+                for key, values in xcs_object.metrics_history.items():
+                    if key == 'steps':
+                        metrics[key][i] = values
+                    else:
+                        metrics[key][i, :len(values)] = values
+
                 i += 1
-                d = self._post_process_episode(config, xcs_object.metrics_history)
-                metrics.append(d)
 
-        metrics_compiled = {key: [] for key in metrics[0].keys()}
+            # the episodes recorded so far are in the memory maps, which outlive a killed process
+            if checkpointer is not None:
+                checkpointer.step(xcs_object, episode=i)
 
-        for data in metrics:
-            for key, value in data.items():
-                metrics_compiled[key].append(value)
+        for data in metrics.values():
+            data.flush()
 
-        # self._save_replication(metrics_compiled, replication_num)
+        self._finish_replication(xcs_object, checkpointer, replication_num)
 
+        return xcs_object.get_population()
 
-    def _save_replication(self, xcs_object, replication_num):
-        self._save_replication_metrics(xcs_object.metrics_history, replication_num)
+    def _open_episode_metrics(self, config, replication_num, first_episode=0):
+        # a resumed replication keeps the episodes before first_episode and rewrites the others
+        metrics = {}
 
-        pop = xcs_object.get_population()
+        for key, filename in self._metric_filenames(replication_num).items():
+            if key == 'steps':
+                shape = (config.episodes_per_replication,)
+            else:
+                shape = (config.episodes_per_replication, config.steps_per_episode)
 
-        path = self._root_data_directory + '/classifiers'
+            if first_episode > 0:
+                metrics[key] = np.lib.format.open_memmap(filename, mode='r+')
+            else:
+                metrics[key] = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float64, shape=shape)
 
-        print(path)
+            metrics[key][first_episode:] = np.nan
 
-        f_name = '{}/replication{}'.format(path, replication_num)
+        return metrics
 
-        with open(f_name, 'wb') as f:
-            pickle.dump(pop, f)
+    def _population_filename(self, replication_num):
+        # columnar population file, see Population.load
+        return '{}/classifiers/replication{}.xpop'.format(self._root_data_directory, replication_num)
 
+    def _profile_filename(self, replication_num):
+        return '{}/profile_replication{}.json'.format(self._root_data_directory, replication_num)
 
-    def _save_replication_metrics(self, metrics, replication_num):
-        # the path to where results are stored
-        path = self._root_data_directory + '/results/'
+    def _checkpoint_filename(self, replication_num):
+        return '{}/checkpoints/replication{}.ckpt'.format(self._root_data_directory, replication_num)
+
+    def _is_finished(self, replication_num):
+        # the population file is only written once a replication is done
+        return self.resume and os.path.exists(self._population_filename(replication_num))
+
+    def _load_population(self, replication_num):
+        print('replication {} already done'.format(replication_num))
+        return Population.load(self._population_filename(replication_num), self.config_class()).to_classifiers()
+
+    def _open_checkpointer(self, replication_num):
+        interval = self.config_class().checkpoint_interval
+
+        if interval > 0:
+            return Checkpointer(self._checkpoint_filename(replication_num), interval)
 
-        for key in metrics.keys():
-            # the filename where we will store this metric
-            filename = path + key + '/replication' + str(replication_num) + '.csv'
+        return None
 
-            if type(metrics[key]) is int:
-                metrics[key] = [metrics[key]]
+    def _load_checkpoint(self, replication_num):
+        # the latest snapshot of the replication when resuming, otherwise None
+        filename = self._checkpoint_filename(replication_num)
 
-            data = np.array(metrics[key])
-            np.savetxt(filename, data, delimiter=',')
+        if self.resume and os.path.exists(filename):
+            print('replication {} resumed from {}'.format(replication_num, filename))
+            return load_checkpoint(filename)
+
+        return None
+
+    def _finish_replication(self, xcs_object, checkpointer, replication_num):
+        if checkpointer is not None:
+            checkpointer.close()
+
+        self._save_population(xcs_object, replication_num)
+        self._save_profile(xcs_object, replication_num)
+
+        # the replication is finished once its population is saved, its checkpoint is no longer needed
+        if os.path.exists(self._checkpoint_filename(replication_num)):
+            os.remove(self._checkpoint_filename(replication_num))
 
         print('replication {} done'.format(replication_num))
+
+    def _save_population(self, xcs_object, replication_num):
+        # written to a temporary file first, so that a population file is always complete
+        f_name = self._population_filename(replication_num)
+        xcs_object.save_population(f_name + '.tmp')
+        os.replace(f_name + '.tmp', f_name)
+
+    def _save_profile(self, xcs_object, replication_num):
+        # total and mean seconds and number of calls of every phase, when the replication was profiled
+        profile = xcs_object.get_profile()
+
+        if profile is not None:
+            with open(self._profile_filename(replication_num), 'w') as f:
+                json.dump({'replication': replication_num, 'phases': profile}, f, indent=2)